@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""Benchmark create_issue.py against a local fake of the GitHub API
+
+Starts an in-process mock of the endpoints the tool uses, then runs the
+single-issue, batch and wizard-batch paths against it in fresh subprocesses
+(so peak memory is measured per run) and reports issues/sec, request
+latency percentiles and peak RSS. No real GitHub quota is used.
+
+With --cold-start it instead times short invocations (--help, an argument
+error, a --dry-run) in fresh interpreters, optionally against the
+create_issue.py of another git revision for a before/after comparison.
+"""
+import os
+import sys
+import argparse
+import json
+import time
+import random
+import hashlib
+import tempfile
+import socket
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+class MockGitHub(ThreadingHTTPServer):
+    """Fake /repos/{owner}/{repo}/issues (plus repo lookup and GraphQL)
+
+    latency:       seconds added to every response (±50% jitter)
+    error_rate:    fraction of writes answered with a 502
+    throttle_rate: fraction of writes answered with a 429 + Retry-After
+    forbidden_rate: fraction of writes answered with a 403 rate limit: an
+                   exhausted primary quota, a secondary limit or abuse detection
+    quota:         requests allowed per rate-limit window, reported in X-RateLimit-*;
+                   once it is used up every request gets a 403 until the window resets
+    Issue lists carry an ETag and answer a matching If-None-Match with 304.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024  # the default backlog of 5 drops connections under load
+
+    def __init__(self, port=0, latency=0.05, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=1, quota=5000, window=3600, forbidden_rate=0.0):
+        super().__init__(('127.0.0.1', port), MockHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.forbidden_rate = forbidden_rate
+        self.retry_after = retry_after
+        self.quota = quota
+        self.window = window
+        self.reset_at = time.time() + window
+        self.used = 0
+        self.issues = {}  # "owner/repo" -> list of issues
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def _roll_window(self):
+        if time.time() >= self.reset_at:
+            self.reset_at = time.time() + self.window
+            self.used = 0
+
+    def take_quota(self):
+        """Count a request against the window; returns (remaining, reset epoch)"""
+        with self.lock:
+            self._roll_window()
+            self.used += 1
+            return max(self.quota - self.used, 0), int(self.reset_at)
+
+    def exhausted(self):
+        """True once every request of the current window is used up"""
+        with self.lock:
+            self._roll_window()
+            return self.used >= self.quota
+
+    def add_issue(self, name, title, body):
+        with self.lock:
+            issues = self.issues.setdefault(name, [])
+            number = len(issues) + 1
+            issue = {"number": number, "title": title, "body": body, "state": "open",
+                     "html_url": f"https://github.com/{name}/issues/{number}"}
+            issues.append(issue)
+            return issue
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without this, Nagle plus
+        # delayed ACKs add ~40 ms to every request on a kept-alive connection
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None, count=True):
+        server = self.server
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        all_headers = {}
+        if count:
+            remaining, reset = server.take_quota()
+            all_headers = {'X-RateLimit-Limit': str(server.quota),
+                           'X-RateLimit-Remaining': str(remaining),
+                           'X-RateLimit-Reset': str(reset)}
+        all_headers.update(headers or {})
+        for name, value in all_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def delay(self):
+        if self.server.latency:
+            time.sleep(self.server.latency * random.uniform(0.5, 1.5))
+
+    def over_quota(self):
+        """Answer 403 like GitHub once the primary quota is used up; True if we did"""
+        if not self.server.exhausted():
+            return False
+        self.send_json(403, {"message": "API rate limit exceeded for user ID 1."})
+        return True
+
+    def forbidden(self):
+        """One of the 403s GitHub uses for rate limits, picked at random"""
+        server = self.server
+        kind = random.choice(('primary', 'secondary', 'abuse'))
+        if kind == 'primary':
+            # Remaining 0 with a reset shortly ahead, as if the quota had just run out
+            self.send_json(403, {"message": "API rate limit exceeded for user ID 1."},
+                           {"X-RateLimit-Remaining": "0",
+                            "X-RateLimit-Reset": str(int(time.time()) + server.retry_after)})
+        elif kind == 'secondary':
+            self.send_json(403, {"message": "You have exceeded a secondary rate limit."},
+                           {"Retry-After": str(server.retry_after)})
+        else:
+            # Only the message tells this one apart from a permission error
+            self.send_json(403, {"message": "You have triggered an abuse detection mechanism. "
+                                            "Please wait a few minutes before you try again."})
+
+    def failure(self):
+        """Maybe answer a write with a simulated error; True if we did"""
+        roll = random.random()
+        if roll < self.server.throttle_rate:
+            self.send_json(429, {"message": "You have exceeded a secondary rate limit."},
+                           {"Retry-After": str(self.server.retry_after)})
+            return True
+        roll -= self.server.throttle_rate
+        if roll < self.server.forbidden_rate:
+            self.forbidden()
+            return True
+        if roll < self.server.forbidden_rate + self.server.error_rate:
+            self.send_json(502, {"message": "Server Error"})
+            return True
+        return False
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        self.delay()
+        if self.over_quota():
+            return
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) == 3 and parts[0] == 'repos':
+            name = f"{parts[1]}/{parts[2]}"
+            return self.send_json(200, {"full_name": name, "node_id": f"R_{name}"})
+        if len(parts) != 4 or parts[0] != 'repos' or parts[3] != 'issues':
+            return self.send_json(404, {"message": "Not Found"})
+
+        name = f"{parts[1]}/{parts[2]}"
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        per_page = int(query.get('per_page', 30))
+        page = int(query.get('page', 1))
+        with self.server.lock:
+            issues = list(self.server.issues.get(name, []))
+        items = issues[(page - 1) * per_page:page * per_page]
+        headers = {}
+        if page * per_page < len(issues):
+            query['page'] = page + 1
+            headers['Link'] = f'<{self.server.url}{url.path}?{urlencode(query)}>; rel="next"'
+        etag = '"%s"' % hashlib.sha1(json.dumps(items).encode('utf-8')).hexdigest()
+        headers['ETag'] = etag
+        if self.headers.get('If-None-Match') == etag:
+            # Like GitHub, a 304 doesn't count against the rate limit
+            return self.send_json(304, None, headers, count=False)
+        self.send_json(200, items, headers)
+
+    def do_POST(self):
+        self.delay()
+        data = self.read_json()
+        if self.over_quota() or self.failure():
+            return
+        if self.path == '/graphql':
+            return self.graphql(data)
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 4 or parts[0] != 'repos' or parts[3] != 'issues':
+            return self.send_json(404, {"message": "Not Found"})
+        issue = self.server.add_issue(f"{parts[1]}/{parts[2]}", data.get('title'), data.get('body'))
+        self.send_json(201, issue)
+
+    def graphql(self, data):
+        variables = data.get('variables') or {}
+        result = {}
+        n = 0
+        while f"t{n}" in variables:
+            name = variables[f"r{n}"][len('R_'):]
+            issue = self.server.add_issue(name, variables[f"t{n}"], variables.get(f"b{n}"))
+            result[f"i{n}"] = {"issue": {"number": issue['number'], "url": issue['html_url']}}
+            n += 1
+        self.send_json(200, {"data": result})
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+def write_batch(path, size):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(size):
+            f.write(json.dumps({"title": f"Benchmark issue {i}",
+                                "description": f"Generated by benchmark.py ({i})"}) + '\n')
+
+def run_worker(config):
+    """Run one scenario inside this (fresh) process and print its stats as JSON"""
+    os.environ['GITHUB_API_URL'] = config['api_url']
+    os.environ['XDG_CACHE_HOME'] = config['tmp']
+    sys.path.insert(0, HERE)
+    import builtins
+    import contextlib
+    import resource
+    import create_issue
+    # The mock has no content-creation limit; measure the tool, not the cap
+    create_issue.CONTENT_CREATION_PER_MINUTE = 0
+
+    # Time the HTTP round-trips themselves, not the rate limiter's pacing
+    latencies = []
+    lock = threading.Lock()
+    import requests
+    original_request = requests.Session.request
+
+    def timed_request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_request(self, *args, **kwargs)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - started)
+    requests.Session.request = timed_request
+
+    if config.get('options', {}).get('transport') == 'async':
+        import httpx
+        original_async_request = httpx.AsyncClient.request
+
+        async def timed_async_request(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await original_async_request(self, *args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - started)
+        httpx.AsyncClient.request = timed_async_request
+
+    scenario = config['scenario']
+    size = config['size']
+    batch_file = os.path.join(config['tmp'], f"batch-{size}.jsonl")
+    extra = config.get('options', {})
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if scenario == 'single':
+            for i in range(size):
+                try:
+                    create_issue.create_issue('bench', 'repo', f"Single {i}", "Benchmark", 'token')
+                except SystemExit:
+                    pass  # a failed issue exits the CLI; keep going for the measurement
+        elif scenario == 'batch':
+            write_batch(batch_file, size)
+            create_issue.create_batch_issues('bench', 'repo', batch_file, 'token',
+                                             concurrency=config['concurrency'],
+                                             journal_path=batch_file + '.journal', **extra)
+        elif scenario == 'wizard-batch':
+            write_batch(batch_file, size)
+            os.environ['GITHUB_TOKEN'] = 'token'
+            answers = iter(['bench/repo', '2', '1', batch_file, 'y'])
+            builtins.input = lambda prompt='': next(answers)
+            create_issue.interactive_wizard()
+        else:
+            raise ValueError(f"Unknown scenario {scenario}")
+    elapsed = time.perf_counter() - started
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+    print(json.dumps({"elapsed": elapsed, "latencies": latencies, "rss_mb": rss_mb}))
+
+def time_command(command, runs, env=None):
+    """Wall-clock seconds of `runs` fresh runs of a command"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       stdin=subprocess.DEVNULL, env=env)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def cold_start(runs, baseline=None):
+    """Time short CLI invocations, where interpreter start and imports dominate"""
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_file = os.path.join(tmp, "batch.jsonl")
+        write_batch(batch_file, 10)
+        scripts = [("current", os.path.join(HERE, "create_issue.py"))]
+        if baseline:
+            old = os.path.join(tmp, "create_issue_baseline.py")
+            try:
+                source = subprocess.run(["git", "show", f"{baseline}:create_issue.py"], cwd=HERE,
+                                        capture_output=True, check=True).stdout
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Could not read create_issue.py at '{baseline}': {e.stderr.decode().strip()}")
+                sys.exit(1)
+            with open(old, 'wb') as f:
+                f.write(source)
+            scripts.insert(0, (baseline, old))
+
+        # No token anywhere, so nothing can reach the network
+        env = {k: v for k, v in os.environ.items() if k != 'GITHUB_TOKEN'}
+        rows = [("python (empty)", "-", [sys.executable, "-c", "pass"]),
+                ("import requests", "-", [sys.executable, "-c", "import requests"])]
+        for label, script in scripts:
+            rows += [
+                ("--help", label, [sys.executable, script, "--help"]),
+                ("argument error", label, [sys.executable, script, "user/repo", "--concurrency", "0"]),
+                ("--dry-run", label, [sys.executable, script, "user/repo", "-b", batch_file, "--dry-run"]),
+            ]
+
+        print(f"🧊 Cold start, median of {runs} fresh runs each")
+        print(f"{'command':<18}{'version':>12}{'p50 ms':>9}{'p95 ms':>9}")
+        print("-" * 48)
+        for name, label, command in rows:
+            timings = [t * 1000 for t in time_command(command, runs, env)]
+            print(f"{name:<18}{label:>12}{percentile(timings, 50):>9.1f}{percentile(timings, 95):>9.1f}")
+
+def run_scenario(server, scenario, size, concurrency, tmp, options=None):
+    config = {"api_url": server.url, "scenario": scenario, "size": size,
+              "concurrency": concurrency, "tmp": tmp, "options": options or {}}
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '_worker', json.dumps(config)],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scenario} run failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '_worker':
+        run_worker(json.loads(sys.argv[2]))
+        return
+
+    parser = argparse.ArgumentParser(
+        description="📊 Benchmark create_issue.py against a local mock GitHub API")
+    parser.add_argument("--scenarios", default="single,batch,wizard-batch",
+                        help="Comma-separated paths to run: single, batch, wizard-batch (default: all)")
+    parser.add_argument("--sizes", default="10,100,1000",
+                        help="Comma-separated numbers of issues per run (default: 10,100,1000)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Workers for the batch scenario (default: 8)")
+    parser.add_argument("--transport", choices=["sync", "async", "graphql"], default="sync",
+                        help="Transport for the batch scenario (default: sync)")
+    parser.add_argument("--latency", type=float, default=50,
+                        help="Mock response latency in milliseconds (default: 50)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of writes answered with a 502 (default: 0)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of writes answered with a 429 rate limit (default: 0)")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0,
+                        help="Fraction of writes answered with a 403 rate limit: primary quota, "
+                             "secondary limit or abuse detection (default: 0; the client waits a "
+                             "minute after abuse 403s, which carry no Retry-After)")
+    parser.add_argument("--retry-after", type=int, default=1,
+                        help="Retry-After seconds sent with simulated rate limits, and how soon "
+                             "a simulated primary limit resets (default: 1)")
+    parser.add_argument("--quota", type=int, default=100000,
+                        help="Requests per rate-limit window reported by the mock (default: 100000)")
+    parser.add_argument("--window", type=int, default=3600,
+                        help="Length of the mock's rate-limit window in seconds (default: 3600)")
+    parser.add_argument("--cold-start", action="store_true",
+                        help="Time short CLI invocations (--help, argument errors, --dry-run) instead")
+    parser.add_argument("--runs", type=int, default=20,
+                        help="Fresh interpreters per command with --cold-start (default: 20)")
+    parser.add_argument("--baseline", metavar="REV",
+                        help="With --cold-start, also time create_issue.py from this git revision")
+    args = parser.parse_args()
+
+    if args.cold_start:
+        cold_start(args.runs, args.baseline)
+        return
+
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    server = MockGitHub(latency=args.latency / 1000.0, error_rate=args.error_rate,
+                        throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                        quota=args.quota, window=args.window,
+                        forbidden_rate=args.forbidden_rate).start()
+    print(f"🧪 Mock GitHub API on {server.url} ({args.latency:.0f} ms latency, "
+          f"{args.error_rate:.0%} errors, {args.throttle_rate:.0%} throttled, "
+          f"{args.forbidden_rate:.0%} forbidden)")
+    print(f"{'scenario':<14}{'issues':>7}{'issues/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'requests':>10}{'RSS MB':>8}")
+    print("-" * 76)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in scenarios:
+            for size in sizes:
+                options = {"transport": args.transport} if scenario == 'batch' else None
+                try:
+                    stats = run_scenario(server, scenario, size, args.concurrency, tmp, options)
+                except RuntimeError as e:
+                    print(f"❌ {e}")
+                    failed = True
+                    continue
+                latencies = [t * 1000 for t in stats['latencies']]
+                print(f"{scenario:<14}{size:>7}{size / stats['elapsed']:>10.1f}"
+                      f"{percentile(latencies, 50):>9.1f}{percentile(latencies, 95):>9.1f}"
+                      f"{percentile(latencies, 99):>9.1f}{len(latencies):>10}{stats['rss_mb']:>8.1f}")
+    server.shutdown()
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
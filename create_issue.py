@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
-import requests
+# requests (and httpx) are imported where they are first needed: importing
+# requests costs more than the rest of startup, and --help, argument errors
+# and --dry-run never touch the network
 import os
 import sys
 import argparse
 import re
 import json
+import time
+import threading
+import contextlib
+import hashlib
+import random
+import fnmatch
 
 def parse_github_url(url):
     """Parse GitHub URL to extract owner and repo"""
@@ -25,17 +33,1324 @@ def parse_github_url(url):
     
     raise ValueError(f"Invalid GitHub URL format: {url}")
 
-def create_issue(owner, repo, title, body, token):
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json"
-    }
-    data = {
-        "title": title,
-        "body": body
-    }
-    response = requests.post(url, headers=headers, json=data)
+# Set while run_concurrently tears down its workers (e.g. on Ctrl+C), so a worker
+# waiting out a rate-limit pause or a backoff leaves at once instead of blocking it
+_stopping = threading.Event()
+
+class Interrupted(Exception):
+    """Raised in a worker whose batch stopped while it was waiting"""
+
+def _sleep(seconds):
+    """time.sleep that raises Interrupted as soon as the workers are told to stop"""
+    if _stopping.wait(seconds):
+        raise Interrupted("Stopped while waiting to send")
+
+class RateLimiter:
+    """Token bucket paced by GitHub's rate-limit headers
+
+    While plenty of quota is left (X-RateLimit-Remaining above LOW_WATER
+    plus a burst of requests that may still be in flight), requests are only
+    limited by the burst size and max_rate. Below that mark the rest of the
+    quota is spread evenly over the time left until X-RateLimit-Reset, so
+    the last requests can't exhaust it early; an exhausted quota pauses
+    until the reset, and Retry-After pauses for exactly as long as GitHub
+    asks.
+    """
+
+    # GitHub asks to wait at least a minute on a secondary limit without Retry-After
+    SECONDARY_LIMIT_PAUSE = 60.0
+    # Requests kept in hand before pacing starts
+    LOW_WATER = 100
+
+    def __init__(self, burst=10, max_rate=None, name=None):
+        self.burst = burst
+        self.max_rate = max_rate
+        self.name = name  # shown when pausing, e.g. which token of a pool
+        self.rate = max_rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate is None:
+            self.tokens = float(self.burst)
+        else:
+            self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Claim the next request slot and return the seconds to wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = self.paused_until - now
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            return max(wait, 0.0)
+
+    def peek(self):
+        """Seconds reserve() would make the next request wait, without claiming a slot"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self.paused_until - now
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            return max(wait, 0.0)
+
+    def acquire(self):
+        """Block until a request may be sent; returns the seconds spent waiting"""
+        waited = 0.0
+        wait = self.reserve()
+        while wait > 0:
+            _sleep(wait)
+            waited += wait
+            # A throttled response may have paused everyone while we slept
+            with self.lock:
+                wait = self.paused_until - time.monotonic()
+        return waited
+
+    def pause(self, seconds):
+        """Hold back every request for the given number of seconds"""
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until <= self.paused_until:
+                return
+            self.paused_until = until
+        which = f" for {self.name}" if self.name else ""
+        print(f"⏳ Rate limit reached{which}, pausing for {seconds:.0f}s")
+
+    def update(self, response):
+        """Adjust the pace from the rate-limit headers of a response"""
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        retry_after = headers.get('Retry-After')
+
+        if remaining is not None and reset is not None:
+            try:
+                remaining = int(remaining)
+                window = max(float(reset) - time.time(), 1.0)
+            except ValueError:
+                remaining = None
+            else:
+                with self.lock:
+                    now = time.monotonic()
+                    self._refill(now)
+                    # Every request of a burst could already be on its way
+                    spare = remaining - self.burst
+                    if spare > self.LOW_WATER:
+                        self.rate = self.max_rate
+                    else:
+                        self.rate = max(spare, 1) / window
+                        if self.max_rate:
+                            self.rate = min(self.rate, self.max_rate)
+                if remaining <= 0:
+                    self.pause(window)
+
+        if retry_after is not None:
+            try:
+                self.pause(float(retry_after))
+            except ValueError:
+                self.pause(self.SECONDARY_LIMIT_PAUSE)
+        elif self.is_throttled(response) and remaining != 0:
+            self.pause(self.SECONDARY_LIMIT_PAUSE)
+
+    @staticmethod
+    def is_throttled(response):
+        """True if GitHub rejected the request because of a rate limit"""
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers:
+            return True
+        try:
+            message = response.json().get('message', '')
+        except ValueError:
+            return False
+        message = message.lower()
+        return 'rate limit' in message or 'abuse' in message
+
+# GitHub's secondary limit on content creation: at most 80 POSTs a minute per account
+CONTENT_CREATION_PER_MINUTE = 80
+CONTENT_CREATION_BURST = 10
+
+def content_creation_limiter(per_minute=None):
+    """RateLimiter for POSTs, which GitHub limits separately from the hourly quota (0: no cap)"""
+    if per_minute is None:
+        per_minute = CONTENT_CREATION_PER_MINUTE
+    return RateLimiter(burst=CONTENT_CREATION_BURST, max_rate=per_minute / 60 if per_minute else None)
+
+def mask_token(token):
+    return f"token …{token[-4:]}"
+
+class TokenSlot:
+    """One token of a TokenPool with its own rate limiters and quota estimate
+
+    `limiter` paces every request from the token's rate-limit headers;
+    `writes` also holds back its POSTs (see content_creation_limiter).
+    """
+
+    def __init__(self, token, limiter, writes=None):
+        self.token = token
+        self.limiter = limiter
+        self.writes = writes or content_creation_limiter()
+        self.remaining = None  # unknown until GitHub reports it
+        self.revoked = False
+
+    def usable(self, now=None):
+        return not self.revoked and self.limiter.paused_until <= (now or time.monotonic())
+
+    def update(self, response):
+        self.limiter.update(response)
+        try:
+            self.remaining = int(response.headers['X-RateLimit-Remaining'])
+        except (KeyError, ValueError):
+            pass
+
+class TokenPool:
+    """Several GitHub tokens sharing the load of one run
+
+    Each token has its own RateLimiter, its own content-creation limiter
+    (`writes_per_minute`, since GitHub's secondary limits are per account)
+    and the remaining quota GitHub last reported for it. Every request goes
+    to the usable token with the most quota left, and a POST to the one
+    whose write limiter lets it through soonest; a throttled token sits out
+    its pause while the others carry on, and a token GitHub rejects (401)
+    is dropped for the rest of the run. A single token is simply a pool of one.
+    """
+
+    def __init__(self, tokens, burst=10, max_rate=None, limiters=None, writes_per_minute=None,
+                 write_limiters=None):
+        tokens = list(dict.fromkeys(tokens))  # drop repeats, keep order
+        if not tokens:
+            raise ValueError("A token pool needs at least one token")
+        limiters = limiters or [RateLimiter(burst=burst, max_rate=max_rate,
+                                            name=mask_token(token) if len(tokens) > 1 else None)
+                                for token in tokens]
+        write_limiters = write_limiters or [content_creation_limiter(writes_per_minute) for _ in tokens]
+        self.slots = [TokenSlot(token, limiter, writes)
+                      for token, limiter, writes in zip(tokens, limiters, write_limiters)]
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.slots)
+
+    def reserve(self, write=False):
+        """Pick a token for the next request: (slot, seconds to wait before sending)
+
+        slot is None when every token is paused; wait for the first to recover
+        and ask again. For a write (POST) the caller still has to reserve the
+        slot's `writes` limiter.
+        """
+        with self.lock:
+            now = time.monotonic()
+            usable = [slot for slot in self.slots if slot.usable(now)]
+            if not usable:
+                live = [slot for slot in self.slots if not slot.revoked]
+                if not live:
+                    raise GitHubAuthError("Every token was rejected by GitHub (401 Bad credentials)")
+                return None, min(slot.limiter.paused_until for slot in live) - now
+            # Unknown quota first, so every token gets measured
+            def quota(slot):
+                return float('inf') if slot.remaining is None else slot.remaining
+            if write:
+                slot = min(usable, key=lambda slot: (slot.writes.peek(), -quota(slot)))
+            else:
+                slot = max(usable, key=quota)
+            if slot.remaining is not None:
+                slot.remaining -= 1  # until the response says otherwise
+        return slot, slot.limiter.reserve()
+
+    def acquire(self, write=False):
+        """Block until a token may send; returns (slot, seconds spent waiting)
+
+        A write also waits for the chosen token's content-creation limiter.
+        """
+        waited = 0.0
+        while True:
+            slot, wait = self.reserve(write)
+            if slot is not None and write:
+                wait = max(wait, slot.writes.reserve())
+            if wait > 0:
+                _sleep(wait)
+                waited += wait
+            # The token may have been paused while we slept
+            if slot is not None and slot.usable():
+                return slot, waited
+
+    def revoke(self, slot):
+        """Drop a rejected token; True if others remain to retry with"""
+        if len(self.slots) == 1:
+            return False  # a lone token's 401 is simply the answer
+        with self.lock:
+            if not slot.revoked:
+                print(f"🔑 GitHub rejected {mask_token(slot.token)}; leaving it out from now on")
+            slot.revoked = True
+            return any(not other.revoked for other in self.slots)
+
+# Throttled requests are retried without counting as failures, up to this many times
+MAX_THROTTLE_RETRIES = 10
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient failures
+
+    5xx answers and connection errors are retried up to `max_attempts`
+    attempts in total, waiting a random time between 0 and
+    base_delay * 2**retry (capped at max_delay) so parallel workers don't
+    retry in lockstep. Other 4xx answers are never retried; rate limits are
+    handled separately by the RateLimiter.
+    """
+
+    TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+    # Methods that can be repeated without creating anything twice
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry):
+        """Seconds to wait before the given retry (1 for the first)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    def is_transient(self, response):
+        return response.status_code in self.TRANSIENT_STATUSES
+
+    def wait(self, retry, reason):
+        delay = self.delay(retry)
+        print(f"🔁 {reason}; retrying in {delay:.1f}s ({retry}/{self.max_attempts - 1})")
+        return delay
+
+def _issue_since(started):
+    """ISO timestamp a little before `started`, allowing for clock skew with GitHub"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(started - 60))
+
+def _match_created_issue(issues, title, body, since, claimed):
+    """The issue among `issues` with this title and body, created since `since`
+
+    Issues whose number is in `claimed` (already created by this client)
+    are ignored so identical batch items are never mistaken for each other.
+    """
+    for issue in issues:
+        if ('pull_request' not in issue and issue['number'] not in claimed
+                and issue.get('created_at', since) >= since
+                and issue['title'] == title and (issue.get('body') or '') == (body or '')):
+            return issue
+    return None
+
+def _reached_older_issues(issues, since):
+    """True if a page sorted newest first ends with an issue created before `since`"""
+    return bool(issues) and issues[-1].get('created_at', since) < since
+
+def _recovered_response(issue):
+    """A 201 response for an issue found to exist after an ambiguous failure"""
+    import requests
+    response = requests.Response()
+    response.status_code = 201
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps(issue).encode('utf-8')
+    response.recovered = True
+    return response
+
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+GITHUB_GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL")
+
+def graphql_url_for(api_url):
+    """GraphQL endpoint matching a REST API base URL (github.com or GitHub Enterprise)"""
+    if GITHUB_GRAPHQL_URL:
+        return GITHUB_GRAPHQL_URL
+    api_url = api_url.rstrip('/')
+    if api_url.endswith('/api/v3'):
+        return api_url[:-len('/v3')] + '/graphql'
+    return api_url + '/graphql'
+
+class GitHubAuthError(Exception):
+    """Raised when no token of a pool is accepted by GitHub"""
+
+class GitHubAPIError(Exception):
+    """Raised when GitHub answers a request with an unexpected status"""
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        try:
+            self.message = response.json().get('message', 'Unknown error')
+        except ValueError:
+            self.message = response.text[:200] or 'Unknown error'
+        super().__init__(f"{self.status_code}: {self.message}")
+
+# Connection setup time (TCP + TLS) of the request running on this thread
+_request_timing = threading.local()
+
+def _timed_adapter(pool_size):
+    """HTTPAdapter whose connections record how long connect() took"""
+    import requests
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    def timed(connection_class):
+        class TimedConnection(connection_class):
+            def connect(self):
+                started = time.perf_counter()
+                try:
+                    super().connect()
+                finally:
+                    _request_timing.connect = (getattr(_request_timing, 'connect', 0.0)
+                                               + time.perf_counter() - started)
+        return TimedConnection
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = timed(HTTPConnection)
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = timed(HTTPSConnection)
+
+    class TimedAdapter(requests.adapters.HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': TimedHTTPConnectionPool,
+                'https': TimedHTTPSConnectionPool,
+            }
+
+    return TimedAdapter(pool_connections=1, pool_maxsize=pool_size)
+
+METRICS_FORMATS = ('jsonl', 'prom')
+
+class Metrics:
+    """Timing of every GitHub API call, exported and summarized at the end
+
+    Each HTTP exchange is recorded with its connect (TCP + TLS), time to
+    first byte and total time, status, retry number and why it was repeated
+    ('rate_limit', 'error' or 'token'), rate-limit remaining and how long
+    the rate limiter held it back. Backoff sleeps between retries are
+    added up separately. In 'jsonl' format every
+    record is appended to the file as one JSON line; in 'prom' format a
+    Prometheus textfile-collector file is written when the run ends.
+    """
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, path=None, fmt='jsonl'):
+        self.path = path
+        self.fmt = fmt
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8') if path and fmt == 'jsonl' else None
+        self.totals = []  # seconds per request
+        self.statuses = {}
+        self.connect = 0.0
+        self.server = 0.0
+        self.transfer = 0.0
+        self.waited = 0.0
+        self.backoff = 0.0
+        self.retries = {}  # reason -> requests repeated for it
+        self.cached = 0
+        self.remaining = None
+
+    def record(self, method, url, status, total, ttfb=None, connect=None, waited=0.0,
+               retry=0, remaining=None, cached=False, retry_reason=None):
+        """Record one HTTP exchange (times in seconds)"""
+        event = {
+            "ts": round(time.time(), 3),
+            "method": method,
+            "url": url.split('?')[0],
+            "status": status,
+            "connect_ms": None if connect is None else round(connect * 1000, 2),
+            "ttfb_ms": None if ttfb is None else round(ttfb * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+            "wait_ms": round(waited * 1000, 2),
+            "retry": retry,
+            "retry_reason": retry_reason,
+            "ratelimit_remaining": None if remaining is None else int(remaining),
+            "cached": cached,
+        }
+        with self.lock:
+            self.totals.append(total)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.waited += waited
+            if retry_reason:
+                self.retries[retry_reason] = self.retries.get(retry_reason, 0) + 1
+            self.cached += 1 if cached else 0
+            if remaining is not None:
+                self.remaining = event["ratelimit_remaining"]
+            if ttfb is not None:
+                self.connect += connect or 0.0
+                self.server += max(ttfb - (connect or 0.0), 0.0)
+                self.transfer += max(total - ttfb, 0.0)
+            else:
+                self.server += total
+            if self.file is not None:
+                self.file.write(json.dumps(event) + '\n')
+
+    def record_backoff(self, seconds):
+        """Record a sleep before retrying a failed request"""
+        with self.lock:
+            self.backoff += seconds
+
+    def histogram(self):
+        """Cumulative request counts per latency bucket, Prometheus-style"""
+        counts = []
+        for bound in self.BUCKETS_MS:
+            counts.append((bound, sum(1 for t in self.totals if t * 1000 <= bound)))
+        return counts
+
+    def write_prometheus(self):
+        histogram = self.histogram()
+        lines = [
+            "# HELP create_issue_request_duration_seconds GitHub API request duration",
+            "# TYPE create_issue_request_duration_seconds histogram",
+        ]
+        for bound, count in histogram:
+            lines.append(f'create_issue_request_duration_seconds_bucket{{le="{bound / 1000}"}} {count}')
+        lines += [
+            f'create_issue_request_duration_seconds_bucket{{le="+Inf"}} {len(self.totals)}',
+            f"create_issue_request_duration_seconds_sum {sum(self.totals):.6f}",
+            f"create_issue_request_duration_seconds_count {len(self.totals)}",
+            "# HELP create_issue_requests_total GitHub API requests by status",
+            "# TYPE create_issue_requests_total counter",
+        ]
+        for status, count in sorted(self.statuses.items(), key=lambda item: str(item[0])):
+            lines.append(f'create_issue_requests_total{{status="{status}"}} {count}')
+        lines += [
+            "# HELP create_issue_time_seconds_total Time spent per phase of the requests",
+            "# TYPE create_issue_time_seconds_total counter",
+            f'create_issue_time_seconds_total{{phase="connect"}} {self.connect:.6f}',
+            f'create_issue_time_seconds_total{{phase="server"}} {self.server:.6f}',
+            f'create_issue_time_seconds_total{{phase="transfer"}} {self.transfer:.6f}',
+            f'create_issue_time_seconds_total{{phase="throttle_wait"}} {self.waited:.6f}',
+            f'create_issue_time_seconds_total{{phase="backoff"}} {self.backoff:.6f}',
+            "# HELP create_issue_retries_total Requests repeated, by reason (rate_limit: throttled, "
+            "error: 5xx or connection error, token: token rejected)",
+            "# TYPE create_issue_retries_total counter",
+        ]
+        for reason in ('rate_limit', 'error', 'token'):
+            lines.append(f'create_issue_retries_total{{reason="{reason}"}} {self.retries.get(reason, 0)}')
+        if self.remaining is not None:
+            lines += [
+                "# HELP create_issue_ratelimit_remaining Last X-RateLimit-Remaining seen",
+                "# TYPE create_issue_ratelimit_remaining gauge",
+                f"create_issue_ratelimit_remaining {self.remaining}",
+            ]
+        # Write atomically so the node exporter never reads a partial file
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp, self.path)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        if self.path and self.fmt == 'prom':
+            self.write_prometheus()
+
+    def print_summary(self):
+        if not self.totals:
+            return
+        totals_ms = sorted(t * 1000 for t in self.totals)
+
+        def pct(p):
+            return totals_ms[min(int(len(totals_ms) * p / 100), len(totals_ms) - 1)]
+
+        print(f"\n📈 Request metrics ({len(totals_ms)} requests"
+              + (f", {self.cached} served from cache" if self.cached else "") + ")")
+        print(f"   Latency: p50 {pct(50):.0f} ms | p95 {pct(95):.0f} ms | "
+              f"p99 {pct(99):.0f} ms | max {totals_ms[-1]:.0f} ms")
+        previous = 0
+        peak = max(max(count for _, count in self.histogram()), 1)
+        for bound, count in self.histogram() + [(None, len(totals_ms))]:
+            in_bucket = count - previous
+            previous = count
+            if in_bucket:
+                label = f"≤{bound} ms" if bound else f">{self.BUCKETS_MS[-1]} ms"
+                print(f"   {label:>10} {'█' * max(1, round(in_bucket / peak * 30))} {in_bucket}")
+        spent = self.connect + self.server + self.transfer + self.waited + self.backoff
+        if spent:
+            print("   Time spent: " + " | ".join(
+                f"{name} {seconds:.1f}s ({seconds / spent:.0%})"
+                for name, seconds in (("connect+TLS", self.connect), ("GitHub", self.server),
+                                      ("transfer", self.transfer), ("throttle waits", self.waited),
+                                      ("backoff", self.backoff))))
+        statuses = sorted(self.statuses.items(), key=lambda item: str(item[0]))
+        print("   Statuses: " + ", ".join(f"{status} × {count}" for status, count in statuses))
+        if self.path:
+            print(f"   📄 Metrics written to '{self.path}'")
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "create_issue")
+
+def private_makedirs(directory):
+    """os.makedirs for cached data: every directory created is only readable by this user
+
+    The cache holds responses from private repositories, so `directory` itself
+    is also tightened if an older version created it with the umask.
+    """
+    if os.path.isdir(directory):
+        if os.stat(directory).st_mode & 0o077:
+            os.chmod(directory, 0o700)
+        return
+    parent = os.path.dirname(directory)
+    if parent and not os.path.isdir(parent):
+        private_makedirs(parent)
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass  # created by another worker meanwhile
+
+def open_private(path):
+    """Open a new file for writing bytes that only this user can read"""
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb')
+
+class ResponseCache:
+    """On-disk cache of GET responses, revalidated with ETag / Last-Modified
+
+    Entries are keyed by URL and a hash of the token (so different tokens
+    never see each other's responses). A cached entry is sent back as
+    If-None-Match / If-Modified-Since; GitHub answers an unchanged resource
+    with 304, which does not count against the rate limit. Entries older than
+    `ttl` seconds are dropped, and the least recently used ones are evicted
+    once the cache grows beyond `max_bytes`.
+    """
+
+    def __init__(self, directory=None, max_bytes=50 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.directory = os.path.join(directory or default_cache_dir(), "http")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = None  # total bytes on disk, computed on first store
+        self.lock = threading.Lock()
+
+    def _path(self, url, token):
+        scope = hashlib.sha256((token or '').encode('utf-8')).hexdigest()
+        key = hashlib.sha256(f"{scope}\0{url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, url, token):
+        """Return the cached entry for a URL, or None if missing or expired"""
+        path = self._path(url, token)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('stored_at', 0) > self.ttl:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return entry
+
+    def put(self, url, token, response):
+        """Store a 200 response if GitHub gave it a validator"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {k: v for k, v in response.headers.items()
+                        if k.lower() in ('content-type', 'link', 'etag', 'last-modified')},
+            "body": response.text,
+            "stored_at": time.time(),
+        }
+        path = self._path(url, token)
+        data = json.dumps(entry).encode('utf-8')
+        try:
+            private_makedirs(self.directory)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open_private(tmp) as f:
+                f.write(data)
+            with self.lock:
+                old = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp, path)
+                if self.size is None:
+                    self.size = self._disk_usage()
+                else:
+                    self.size += len(data) - old
+                if self.size > self.max_bytes:
+                    self._evict()
+        except OSError:
+            pass  # caching is best-effort
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as it:
+                return [(e.stat().st_mtime, e.stat().st_size, e.path)
+                        for e in it if e.name.endswith('.json')]
+        except OSError:
+            return []
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Drop least recently used entries until we're back under 90% of the limit
+        for _, size, path in sorted(self._entries()):
+            if self.size <= self.max_bytes * 0.9:
+                break
+            self._remove(path)
+            self.size -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def to_response(entry, revalidation):
+        """Rebuild a 200 response from a cache entry confirmed by a 304"""
+        import requests
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = entry['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = entry['url']
+        response.request = revalidation.request
+        response.headers = requests.structures.CaseInsensitiveDict(entry['headers'])
+        # Keep the fresh rate-limit headers from the 304
+        for k, v in revalidation.headers.items():
+            if k.lower().startswith('x-ratelimit'):
+                response.headers[k] = v
+        response.from_cache = True
+        return response
+
+DEFAULT_LABEL_COLOR = "ededed"
+
+class RepoMetadata:
+    """Lookup tables for a repository's labels and milestones
+
+    Labels are matched by name ignoring case, like GitHub does; milestones
+    by number or exact title.
+    """
+
+    def __init__(self, labels=(), milestones=()):
+        self.labels = {}  # lower-cased name -> label
+        self.milestones = {}  # title -> milestone
+        self.milestone_numbers = {}  # number -> milestone
+        for label in labels:
+            self.add_label(label)
+        for milestone in milestones:
+            self.milestones[milestone['title']] = milestone
+            self.milestone_numbers[milestone['number']] = milestone
+
+    def add_label(self, label):
+        self.labels[label['name'].lower()] = label
+
+    def label(self, name):
+        return self.labels.get(name.lower())
+
+    def milestone(self, reference):
+        if isinstance(reference, int):
+            return self.milestone_numbers.get(reference)
+        return self.milestones.get(reference)
+
+def triage_fields(issue, metadata=None):
+    """REST fields for a batch item's labels, assignees and milestone
+
+    Label names take the repository's spelling and milestones are resolved
+    to their number, so `metadata` is needed when the item has either.
+    """
+    fields = {}
+    if issue.get('labels'):
+        fields['labels'] = [metadata.label(name)['name'] for name in issue['labels']]
+    if issue.get('assignees'):
+        fields['assignees'] = list(issue['assignees'])
+    if 'milestone' in issue:
+        fields['milestone'] = metadata.milestone(issue['milestone'])['number']
+    return fields
+
+class GitHubClient:
+    """Pooled, keep-alive connection to the GitHub REST API
+
+    A single client is shared by every request of a run, so connections and
+    their TLS handshakes are reused instead of being set up once per issue.
+    """
+
+    def __init__(self, token, pool_size=10, limiter=None, api_url=GITHUB_API_URL, cache=None,
+                 metrics=None, retry=None, tokens=None, write_limiter=None):
+        self.api_url = api_url.rstrip('/')
+        self.graphql_url = graphql_url_for(self.api_url)
+        self.token = token
+        # `tokens` (a TokenPool) spreads requests over several tokens; `token` then
+        # only names the run, e.g. for the response cache. Otherwise `limiter` and
+        # `write_limiter` (for POSTs) pace the one token.
+        self.tokens = tokens or TokenPool([token], limiters=[limiter or RateLimiter(burst=pool_size)],
+                                          write_limiters=[write_limiter] if write_limiter else None)
+        self.limiter = self.tokens.slots[0].limiter
+        self.cache = cache
+        self.metrics = metrics
+        self.retry = retry or RetryPolicy()
+        self.claimed = {}  # (owner, repo) -> numbers of the issues this client created
+        self.repository_ids = {}  # (owner, repo) -> GraphQL node ID
+        self.repository_ids_lock = threading.Lock()
+        self.metadata = {}  # (owner, repo) -> RepoMetadata
+        self.user_ids = {}  # login -> GraphQL node ID
+        self.lookup_lock = threading.Lock()
+        import requests
+        self.session = requests.Session()
+        if metrics is not None:
+            adapter = _timed_adapter(pool_size)
+        else:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json"
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def _never_sent(error):
+        """True if a request failed before any of it could reach GitHub
+
+        That is a connect timeout, a refused connection or a failed DNS
+        lookup (urllib3's NameResolutionError is a NewConnectionError).
+        """
+        import requests
+        import urllib3
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        cause = error.args[0] if error.args else None
+        reason = getattr(cause, 'reason', cause)  # requests wraps urllib3's MaxRetryError
+        return isinstance(reason, (urllib3.exceptions.ConnectTimeoutError,
+                                   urllib3.exceptions.NewConnectionError))
+
+    def request(self, method, path, find_created=None, **kwargs):
+        """Send a rate-limited request, retrying throttled and transient failures
+
+        Throttled attempts wait for the rate limiter; 5xx answers and
+        connection errors are retried with backoff per the client's
+        RetryPolicy. A POST that may already have reached GitHub is only
+        retried if `find_created(since)` is given and finds nothing: if it
+        returns a response, that is used instead of sending again. The
+        counts are stored on the final response as `response.throttled` and
+        `response.retries`. GET requests are revalidated against the
+        response cache when the client has one.
+        """
+        import requests
+        url = path if path.startswith(('http://', 'https://')) else self.api_url + path
+        entry = None
+        if self.cache is not None and method == 'GET':
+            url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+            entry = self.cache.get(url, self.token)
+            if entry is not None:
+                kwargs['headers'] = {**kwargs.get('headers', {}),
+                                     **ResponseCache.conditional_headers(entry)}
+        first_sent = time.time()
+        throttled = 0
+        retries = 0
+        repeat = None  # why the current attempt is a repeat, for the metrics
+        while True:
+            slot, waited = self.tokens.acquire(write=method == 'POST')
+            headers = {**kwargs.pop('headers', {}), "Authorization": f"Bearer {slot.token}"}
+            _request_timing.connect = 0.0
+            started = time.perf_counter()
+            error = None
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                response = None
+            if self.metrics is not None:
+                if response is not None:
+                    self.metrics.record(method, url, response.status_code, time.perf_counter() - started,
+                                        ttfb=response.elapsed.total_seconds(),
+                                        connect=_request_timing.connect, waited=waited,
+                                        retry=throttled + retries, retry_reason=repeat,
+                                        remaining=response.headers.get('X-RateLimit-Remaining'),
+                                        cached=response.status_code == 304)
+                else:
+                    self.metrics.record(method, url, type(error).__name__, time.perf_counter() - started,
+                                        waited=waited, retry=throttled + retries, retry_reason=repeat)
+            kwargs['headers'] = headers
+            if response is not None:
+                slot.update(response)
+                if response.status_code == 401 and self.tokens.revoke(slot):
+                    repeat = 'token'
+                    continue  # nothing was done with a rejected token; try another
+                if slot.limiter.is_throttled(response) and throttled < MAX_THROTTLE_RETRIES:
+                    throttled += 1
+                    repeat = 'rate_limit'
+                    continue
+                if not self.retry.is_transient(response):
+                    break
+            if retries + 1 >= self.retry.max_attempts:
+                break
+            if method not in RetryPolicy.IDEMPOTENT_METHODS and (response is not None
+                                                                 or not self._never_sent(error)):
+                # GitHub may have acted on it; only retry once we know it didn't
+                if find_created is None:
+                    break
+                existing = find_created(_issue_since(first_sent))
+                if existing is not None:
+                    response, error = existing, None
+                    break
+            retries += 1
+            repeat = 'error'
+            reason = f"GitHub answered {response.status_code}" if response is not None else f"{error}"
+            delay = self.retry.wait(retries, reason)
+            if self.metrics is not None:
+                self.metrics.record_backoff(delay)
+            _sleep(delay)
+        if error is not None:
+            raise error
+        if entry is not None and response.status_code == 304:
+            response = ResponseCache.to_response(entry, response)
+        elif self.cache is not None and method == 'GET' and response.status_code == 200:
+            self.cache.put(url, self.token, response)
+        response.throttled = throttled
+        response.retries = retries
+        return response
+
+    def find_created_issue(self, owner, repo, title, body, since):
+        """Response for an issue with this title and body created since `since`, or None
+
+        Pages are read newest first until one reaches an issue created
+        before `since`, so the match is found however many issues were
+        filed in the repo meanwhile.
+        """
+        claimed = set(self.claimed.get((owner, repo), ()))
+        url = f"/repos/{owner}/{repo}/issues"
+        params = {"state": "all", "since": since, "sort": "created", "direction": "desc", "per_page": 100}
+        while url:
+            response = self.request('GET', url, params=params)
+            if response.status_code != 200:
+                return None
+            issues = response.json()
+            issue = _match_created_issue(issues, title, body, since, claimed)
+            if issue:
+                return _recovered_response(issue)
+            if _reached_older_issues(issues, since):
+                return None
+            url = response.links.get('next', {}).get('url')
+            params = None  # the next link carries them
+        return None
+
+    def create_issue(self, owner, repo, title, body, fields=None):
+        """POST a new issue and return the response
+
+        `fields` may add 'labels', 'assignees' and 'milestone' (see
+        triage_fields). Retries after an ambiguous failure first check
+        whether GitHub created the issue anyway, so an issue is never
+        created twice.
+        """
+        response = self.request('POST', f"/repos/{owner}/{repo}/issues",
+                                json={"title": title, "body": body, **(fields or {})},
+                                find_created=lambda since: self.find_created_issue(
+                                    owner, repo, title, body, since))
+        if response.status_code == 201:
+            self.claimed.setdefault((owner, repo), set()).add(response.json()['number'])
+        return response
+
+    def update_issue(self, owner, repo, number, changes):
+        """PATCH an existing issue with `changes` (REST field names) and return the response
+
+        PATCH sets fields to given values, so it is safe to retry.
+        """
+        return self.request('PATCH', f"/repos/{owner}/{repo}/issues/{number}", json=changes)
+
+    def repository_id(self, owner, repo):
+        """GraphQL node ID of a repository (looked up once per client)"""
+        with self.repository_ids_lock:
+            if (owner, repo) not in self.repository_ids:
+                response = self.request('GET', f"/repos/{owner}/{repo}")
+                if response.status_code != 200:
+                    raise GitHubAPIError(response)
+                self.repository_ids[(owner, repo)] = response.json()['node_id']
+            return self.repository_ids[(owner, repo)]
+
+    def repo_metadata(self, owner, repo, refresh=False):
+        """Labels and milestones of a repository (fetched once per client unless `refresh`)"""
+        with self.lookup_lock:
+            if refresh or (owner, repo) not in self.metadata:
+                self.metadata[(owner, repo)] = RepoMetadata(
+                    self.paginate(f"/repos/{owner}/{repo}/labels"),
+                    self.paginate(f"/repos/{owner}/{repo}/milestones", {"state": "all"}))
+            return self.metadata[(owner, repo)]
+
+    def create_label(self, owner, repo, name, color=DEFAULT_LABEL_COLOR):
+        """Create a label and return it (or the existing one if it appeared meanwhile)"""
+        from urllib.parse import quote
+        response = self.request('POST', f"/repos/{owner}/{repo}/labels",
+                                json={"name": name, "color": color})
+        if response.status_code == 201:
+            return response.json()
+        if response.status_code == 422:
+            existing = self.request('GET', f"/repos/{owner}/{repo}/labels/{quote(name, safe='')}")
+            if existing.status_code == 200:
+                return existing.json()
+        raise GitHubAPIError(response)
+
+    def user_id(self, login):
+        """GraphQL node ID of a user (looked up once per client)"""
+        with self.lookup_lock:
+            if login not in self.user_ids:
+                response = self.request('GET', f"/users/{login}")
+                if response.status_code != 200:
+                    raise GitHubAPIError(response)
+                self.user_ids[login] = response.json()['node_id']
+            return self.user_ids[login]
+
+    def create_issues_graphql(self, issues):
+        """Create several issues with a single aliased GraphQL mutation
+
+        `issues` is a list of (owner, repo, title, body, fields), with
+        `fields` as for create_issue; labels, assignees and milestones are
+        translated to their node IDs. Returns one entry per issue, in order:
+        a dict with 'number' and 'url' (and 'recovered' if it was found
+        afterwards), the error message GitHub gave for that issue (so it was
+        not created), or a dict with only 'error' when it is unknown whether
+        it was created. Raises GitHubAPIError if the request as a whole is
+        rejected.
+
+        A request-wide error (e.g. a timeout, answered with 200 and no
+        data) may come after some aliases already ran, so every issue
+        without an error of its own is looked up with find_created_issue.
+        """
+        declarations = []
+        fields = []
+        variables = {}
+        for n, (owner, repo, title, body, extra) in enumerate(issues):
+            declaration = f"$r{n}: ID!, $t{n}: String!, $b{n}: String"
+            arguments = f"repositoryId: $r{n}, title: $t{n}, body: $b{n}"
+            variables.update({f"r{n}": self.repository_id(owner, repo), f"t{n}": title, f"b{n}": body})
+            if extra.get('labels'):
+                metadata = self.repo_metadata(owner, repo)
+                declaration += f", $l{n}: [ID!]"
+                arguments += f", labelIds: $l{n}"
+                variables[f"l{n}"] = [metadata.label(name)['node_id'] for name in extra['labels']]
+            if extra.get('assignees'):
+                declaration += f", $a{n}: [ID!]"
+                arguments += f", assigneeIds: $a{n}"
+                variables[f"a{n}"] = [self.user_id(login) for login in extra['assignees']]
+            if 'milestone' in extra:
+                declaration += f", $m{n}: ID"
+                arguments += f", milestoneId: $m{n}"
+                variables[f"m{n}"] = self.repo_metadata(owner, repo).milestone(extra['milestone'])['node_id']
+            declarations.append(declaration)
+            fields.append(f"i{n}: createIssue(input: {{{arguments}}}) {{ issue {{ number url }} }}")
+        query = f"mutation({', '.join(declarations)}) {{\n  " + "\n  ".join(fields) + "\n}"
+
+        sent = time.time()
+        response = self.request('POST', self.graphql_url, json={"query": query, "variables": variables})
+        if response.status_code != 200:
+            raise GitHubAPIError(response)
+        payload = response.json()
+        data = payload.get('data') or {}
+        errors = {}  # alias (None for request-wide errors) -> message
+        for error in payload.get('errors') or []:
+            path = error.get('path') or [None]
+            errors.setdefault(path[0], error.get('message', 'Unknown error'))
+
+        outcomes = []
+        for n, (owner, repo, title, body, _) in enumerate(issues):
+            created = (data.get(f"i{n}") or {}).get('issue')
+            if created:
+                self.claimed.setdefault((owner, repo), set()).add(created['number'])
+                outcomes.append({'number': created['number'], 'url': created['url']})
+            elif f"i{n}" in errors:
+                outcomes.append(errors[f"i{n}"])
+            else:
+                # Nothing says whether this alias ran before the request failed
+                message = errors.get(None) or "Issue was not created"
+                try:
+                    found = self.find_created_issue(owner, repo, title, body, _issue_since(sent))
+                except Exception as e:
+                    outcomes.append({'error': f"{message}; could not check whether it was created - {e}"})
+                    continue
+                if found is None:
+                    outcomes.append(message)
+                    continue
+                issue = found.json()
+                self.claimed.setdefault((owner, repo), set()).add(issue['number'])
+                outcomes.append({'number': issue['number'], 'url': issue['html_url'], 'recovered': True})
+        return outcomes
+
+    def paginate(self, path, params=None):
+        """Yield every item of a list endpoint, following the Link header's next page"""
+        params = dict(params or {})
+        params.setdefault('per_page', 100)
+        url = path
+        while url:
+            response = self.request('GET', url, params=params)
+            if response.status_code != 200:
+                raise GitHubAPIError(response)
+            yield from response.json()
+            # The next link already carries every query parameter
+            url = response.links.get('next', {}).get('url')
+            params = None
+
+    @staticmethod
+    def _last_page(response):
+        """Number of the last page from a list response's Link header, or None"""
+        from urllib.parse import urlparse, parse_qs
+        last = response.links.get('last', {}).get('url')
+        if last is None:
+            return None
+        return int(parse_qs(urlparse(last).query)['page'][0])
+
+    def page_count(self, path, params=None):
+        """How many pages a list endpoint has, read from its first page
+
+        None if there is more than one page but no 'last' link to count
+        them. paginate_pages asks for the same first page again, which the
+        response cache answers with a 304.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', 100)
+        response = self.request('GET', path, params=params)
+        if response.status_code != 200:
+            raise GitHubAPIError(response)
+        pages = self._last_page(response)
+        if pages is None and 'next' not in response.links:
+            return 1
+        return pages
+
+    def paginate_pages(self, path, params=None, concurrency=1):
+        """Yield every page of a list endpoint in order, fetching up to `concurrency` at once
+
+        The first page's Link header tells how many pages there are, so the
+        rest are requested by number in parallel. Each page is its own GET,
+        so unchanged pages are revalidated with ETags like any other read.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', 100)
+        response = self.request('GET', path, params=params)
+        if response.status_code != 200:
+            raise GitHubAPIError(response)
+        yield response.json()
+        pages = self._last_page(response)
+        if pages is None:
+            # No 'last' link: a single page, or an endpoint that can only be followed
+            while 'next' in response.links:
+                response = self.request('GET', response.links['next']['url'])
+                if response.status_code != 200:
+                    raise GitHubAPIError(response)
+                yield response.json()
+            return
+
+        def fetch(page):
+            response = self.request('GET', path, params={**params, 'page': page})
+            if response.status_code != 200:
+                raise GitHubAPIError(response)
+            return response.json()
+
+        yield from run_concurrently(range(2, pages + 1), fetch, concurrency, ordered=True)
+
+TRANSPORTS = ('sync', 'async', 'graphql')
+DEFAULT_GRAPHQL_CHUNK = 20
+
+def _import_httpx():
+    """Import httpx for the async transport, explaining how to get it if missing"""
+    try:
+        import httpx
+    except ImportError:
+        print("❌ Error: The async transport needs the httpx library")
+        print("💡 Install it with: pip install httpx   (add h2 for HTTP/2: pip install 'httpx[http2]')")
+        sys.exit(1)
+    return httpx
+
+class AsyncGitHubClient:
+    """asyncio counterpart of GitHubClient, built on httpx
+
+    Uses HTTP/2 when the h2 package is installed (keep-alive HTTP/1.1
+    otherwise) and the same RateLimiter, so one budget can be shared with
+    a synchronous client.
+    """
+
+    def __init__(self, token, pool_size=10, limiter=None, api_url=GITHUB_API_URL, metrics=None,
+                 retry=None, claimed=None, tokens=None):
+        httpx = _import_httpx()
+        import importlib.util
+        self.httpx = httpx
+        self.api_url = api_url.rstrip('/')
+        self.token = token
+        self.tokens = tokens or TokenPool([token], limiters=[limiter or RateLimiter(burst=pool_size)])
+        self.limiter = self.tokens.slots[0].limiter
+        self.metrics = metrics
+        self.retry = retry or RetryPolicy()
+        self.claimed = {} if claimed is None else claimed
+        self.client = httpx.AsyncClient(
+            http2=importlib.util.find_spec('h2') is not None,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(30.0),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json"
+            })
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _acquire(self, method):
+        """Async TokenPool.acquire: (slot, seconds spent waiting)"""
+        import asyncio
+        waited = 0.0
+        write = method == 'POST'
+        while True:
+            slot, wait = self.tokens.reserve(write)
+            if slot is not None and write:
+                wait = max(wait, slot.writes.reserve())
+            if wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+            if slot is not None and slot.usable():
+                return slot, waited
+
+    async def request(self, method, path, find_created=None, **kwargs):
+        """Send a rate-limited request, retrying like GitHubClient.request"""
+        import asyncio
+        url = path if path.startswith(('http://', 'https://')) else self.api_url + path
+        first_sent = time.time()
+        throttled = 0
+        retries = 0
+        repeat = None
+        while True:
+            slot, waited = await self._acquire(method)
+            started = time.perf_counter()
+            error = None
+            try:
+                response = await self.client.request(
+                    method, url, headers={"Authorization": f"Bearer {slot.token}"}, **kwargs)
+            except self.httpx.TransportError as e:
+                error = e
+                response = None
+            if self.metrics is not None:
+                # httpx doesn't expose connection setup or first-byte times
+                status = response.status_code if response is not None else type(error).__name__
+                self.metrics.record(method, url, status, time.perf_counter() - started,
+                                    waited=waited, retry=throttled + retries, retry_reason=repeat,
+                                    remaining=response.headers.get('X-RateLimit-Remaining')
+                                    if response is not None else None)
+            if response is not None:
+                slot.update(response)
+                if response.status_code == 401 and self.tokens.revoke(slot):
+                    repeat = 'token'
+                    continue
+                if slot.limiter.is_throttled(response) and throttled < MAX_THROTTLE_RETRIES:
+                    throttled += 1
+                    repeat = 'rate_limit'
+                    continue
+                if not self.retry.is_transient(response):
+                    break
+            if retries + 1 >= self.retry.max_attempts:
+                break
+            if method not in RetryPolicy.IDEMPOTENT_METHODS and (
+                    response is not None
+                    or not isinstance(error, (self.httpx.ConnectError, self.httpx.ConnectTimeout))):
+                if find_created is None:
+                    break
+                existing = await find_created(_issue_since(first_sent))
+                if existing is not None:
+                    response, error = existing, None
+                    break
+            retries += 1
+            repeat = 'error'
+            reason = (f"GitHub answered {response.status_code}" if response is not None
+                      else f"{type(error).__name__} {error}".strip())
+            delay = self.retry.wait(retries, reason)
+            if self.metrics is not None:
+                self.metrics.record_backoff(delay)
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        response.throttled = throttled
+        response.retries = retries
+        return response
+
+    async def find_created_issue(self, owner, repo, title, body, since):
+        """Response for an issue with this title and body created since `since`, or None
+
+        Follows the pages like GitHubClient.find_created_issue.
+        """
+        claimed = set(self.claimed.get((owner, repo), ()))
+        url = f"/repos/{owner}/{repo}/issues"
+        params = {"state": "all", "since": since, "sort": "created", "direction": "desc", "per_page": 100}
+        while url:
+            response = await self.request('GET', url, params=params)
+            if response.status_code != 200:
+                return None
+            issues = response.json()
+            issue = _match_created_issue(issues, title, body, since, claimed)
+            if issue:
+                return _recovered_response(issue)
+            if _reached_older_issues(issues, since):
+                return None
+            url = response.links.get('next', {}).get('url')
+            params = None
+        return None
+
+    async def create_issue(self, owner, repo, title, body, fields=None):
+        """POST a new issue and return the response, never creating it twice"""
+        response = await self.request('POST', f"/repos/{owner}/{repo}/issues",
+                                      json={"title": title, "body": body, **(fields or {})},
+                                      find_created=lambda since: self.find_created_issue(
+                                          owner, repo, title, body, since))
+        if response.status_code == 201:
+            self.claimed.setdefault((owner, repo), set()).add(response.json()['number'])
+        return response
+
+    async def update_issue(self, owner, repo, number, changes):
+        """PATCH an existing issue with `changes` (REST field names) and return the response"""
+        return await self.request('PATCH', f"/repos/{owner}/{repo}/issues/{number}", json=changes)
+
+def create_issue(owner, repo, title, body, token, client=None, transport='sync'):
+    if transport == 'async':
+        import asyncio
+
+        async def send():
+            tokens = client.tokens if client else None
+            metrics = client.metrics if client else None
+            retry = client.retry if client else None
+            async with AsyncGitHubClient(token, pool_size=1, tokens=tokens, metrics=metrics,
+                                         retry=retry) as async_client:
+                return await async_client.create_issue(owner, repo, title, body)
+    else:
+        client = client or GitHubClient(token, pool_size=1)
+    try:
+        if transport == 'async':
+            response = asyncio.run(send())
+        else:
+            response = client.create_issue(owner, repo, title, body)
+    except Exception as e:
+        # Connection errors that outlasted every retry
+        print(f"❌ Failed to create issue: {e}")
+        sys.exit(1)
     if response.status_code == 201:
         issue_data = response.json()
         print("✅ Issue created successfully!")
@@ -47,84 +1362,1905 @@ def create_issue(owner, repo, title, body, token):
         print(response.json())
         sys.exit(1)
 
-def create_batch_issues(owner, repo, batch_file, token):
-    """Create multiple issues from a JSON batch file"""
+class BatchFileError(ValueError):
+    """Raised when a batch file cannot be read as a list of issues"""
+
+# Batch files are read in chunks of this size
+BATCH_READ_SIZE = 64 * 1024
+# No single issue should come close to this; stops a broken file being buffered whole
+MAX_BATCH_ITEM_SIZE = 8 * 1024 * 1024
+
+class _JSONStream:
+    """Minimal incremental JSON reader over a text file
+
+    Values are decoded one at a time with JSONDecoder.raw_decode, pulling more
+    of the file in only when the current buffer ends mid-value, so memory use
+    is bounded by the largest single value rather than the file size.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.line = 1
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(BATCH_READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                if self.buf[self.pos] == '\n':
+                    self.line += 1
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            found = repr(found) if found else "end of file"
+            raise BatchFileError(f"Invalid JSON in batch file: expected '{char}' "
+                                 f"on line {self.line}, found {found}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if len(self.buf) - self.pos <= MAX_BATCH_ITEM_SIZE and self._fill():
+                    continue
+                raise BatchFileError(f"Invalid JSON in batch file: {e.msg} on line "
+                                     f"{self.line + self.buf.count(chr(10), self.pos, e.pos)}")
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.line += self.buf.count('\n', self.pos, end)
+            self.pos = end
+            return obj
+
+class TemplateError(ValueError):
+    """Raised when a template can't be rendered for a batch item"""
+
+TEMPLATE_FIELD = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_.-]*)\s*\}\}')
+
+class Template:
+    """Text with {{name}} placeholders, parsed once and rendered per item"""
+
+    def __init__(self, text):
+        self.text = text
+        parts = TEMPLATE_FIELD.split(text)
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+    def render(self, variables):
+        out = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            try:
+                value = variables[name]
+            except KeyError:
+                raise TemplateError(f"No value for {{{{{name}}}}}")
+            if value is None:
+                value = ''
+            out.append(value if isinstance(value, str) else json.dumps(value))
+            out.append(literal)
+        return ''.join(out)
+
+class BatchTemplate:
+    """Title/description templates and default variables for batch items
+
+    Built from a header object: {"template": {"title": ..., "description":
+    ...}, "vars": {...}}. Items that leave out 'title' or 'description' get
+    them rendered from the template, using the header's vars overlaid with
+    the item's own 'vars'.
+    """
+
+    def __init__(self, header, base=None):
+        if not isinstance(header, dict):
+            raise BatchFileError("A template header must be a JSON object")
+        templates = header.get('template') or {}
+        variables = header.get('vars') or {}
+        if not isinstance(templates, dict) or not all(isinstance(templates.get(k, ''), str)
+                                                      for k in ('title', 'description')):
+            raise BatchFileError("'template' must be an object with 'title' and/or 'description' strings")
+        if not isinstance(variables, dict):
+            raise BatchFileError("'vars' must be an object")
+        self.title = Template(templates['title']) if 'title' in templates else None
+        self.description = Template(templates['description']) if 'description' in templates else None
+        self.vars = dict(variables)
+        if base is not None:
+            # A header in the batch file builds on --template
+            self.title = self.title or base.title
+            self.description = self.description or base.description
+            self.vars = {**base.vars, **self.vars}
+
+    @staticmethod
+    def is_header(item):
+        return isinstance(item, dict) and 'template' in item
+
+    def apply(self, issue):
+        """Fill in an item's title/description; template problems go in 'template_error'"""
+        if not isinstance(issue, dict) or not isinstance(issue.get('vars', {}), dict):
+            return issue
+        variables = {**self.vars, **issue.get('vars', {})}
+        issue = dict(issue)
+        try:
+            if 'title' not in issue and self.title is not None:
+                issue['title'] = self.title.render(variables)
+            if 'description' not in issue and self.description is not None:
+                issue['description'] = self.description.render(variables)
+        except TemplateError as e:
+            issue['template_error'] = str(e)
+        return issue
+
+def load_template(path):
+    """Read a BatchTemplate from a JSON file holding a template header"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return BatchTemplate(json.load(f))
+    except (OSError, ValueError) as e:
+        raise BatchFileError(f"Could not read template '{path}': {e}")
+
+def _iter_jsonl(f):
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise BatchFileError(f"Invalid JSON in batch file on line {line_number}: {e.msg}")
+
+def _iter_issues_document(f):
+    stream = _JSONStream(f)
+    missing = BatchFileError("Batch file must contain an 'issues' array")
+    if stream.peek() != '{':
+        raise missing
+    stream.expect('{')
+    if stream.peek() == '}':
+        raise missing
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key == 'issues':
+            stream.expect('[')
+            if stream.peek() == ']':
+                return
+            while True:
+                stream.peek()
+                line_number = stream.line
+                yield line_number, stream.value()
+                if stream.peek() == ',':
+                    stream.pos += 1
+                    continue
+                stream.expect(']')
+                return
+        value = stream.value()
+        # Template headers must come before "issues" so items can be rendered as they stream
+        if key == 'template':
+            yield stream.line, {'template': value}
+        elif key == 'vars':
+            yield stream.line, {'template': {}, 'vars': value}
+        if stream.peek() == ',':
+            stream.pos += 1
+            continue
+        stream.expect('}')
+        raise missing
+
+def _looks_like_jsonl(f, batch_file):
+    """Guess whether a batch file holds one issue object per line"""
+    if batch_file.lower().endswith(('.jsonl', '.ndjson')):
+        return True
+    limit = MAX_BATCH_ITEM_SIZE
+    try:
+        line = f.readline(limit)
+        while line and not line.strip():
+            line = f.readline(limit)
+        if not line.endswith('\n') and len(line) >= limit:
+            return False
+        try:
+            first = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+        return isinstance(first, dict) and 'issues' not in first
+    finally:
+        f.seek(0)
+
+CSV_LIST_COLUMNS = ('labels', 'assignees')
+
+def _iter_csv(f):
+    """Items from a CSV file: every column is a template variable
+
+    Columns named title, description, repo, state, labels, assignees,
+    milestone or number also set that field directly (labels and assignees
+    comma-separated, a numeric milestone is a milestone number, and a
+    number makes the row update that issue). Empty cells are ignored.
+    """
+    import csv
+    reader = csv.DictReader(f)
+    for row in reader:
+        row = {name: value for name, value in row.items() if name and value not in (None, '')}
+        issue = {'vars': row}
+        for name in ('title', 'description', 'repo', 'state'):
+            if name in row:
+                issue[name] = row[name]
+        for name in CSV_LIST_COLUMNS:
+            if name in row:
+                issue[name] = [value.strip() for value in row[name].split(',') if value.strip()]
+        if 'milestone' in row:
+            issue['milestone'] = int(row['milestone']) if row['milestone'].isdigit() else row['milestone']
+        if 'number' in row:
+            issue['number'] = int(row['number']) if row['number'].isdigit() else row['number']
+        yield reader.line_num, issue
+
+def iter_batch_issues(batch_file, template=None):
+    """Stream (line number, issue) pairs from a batch file
+
+    Accepts JSON Lines (one issue object per line, .jsonl/.ndjson) as well as
+    the {"issues": [...]} document, which is parsed incrementally, and CSV
+    (.csv) rows. Nothing is held in memory beyond the issue being yielded.
+
+    Items are rendered from `template` (a BatchTemplate) and from template
+    headers in the file: a {"template": ..., "vars": ...} line in JSON Lines,
+    or top-level "template" and "vars" keys before "issues" in a document.
+    """
+    with open(batch_file, 'r', encoding='utf-8', newline='' if batch_file.lower().endswith('.csv') else None) as f:
+        if batch_file.lower().endswith('.csv'):
+            items = _iter_csv(f)
+        elif _looks_like_jsonl(f, batch_file):
+            items = _iter_jsonl(f)
+        else:
+            items = _iter_issues_document(f)
+        for line_number, issue in items:
+            if BatchTemplate.is_header(issue):
+                template = BatchTemplate(issue, base=template)
+            elif template is not None:
+                yield line_number, template.apply(issue)
+            else:
+                yield line_number, issue
+
+# Limits enforced by GitHub when creating an issue
+MAX_TITLE_LENGTH = 256
+MAX_BODY_LENGTH = 65536
+MAX_LABEL_LENGTH = 50
+MAX_ASSIGNEES = 10
+GITHUB_LOGIN = re.compile(r'^[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38}$')
+ISSUE_STATES = ('open', 'closed')
+# Fields an item with a 'number' can change on the existing issue
+UPDATABLE_FIELDS = ('title', 'description', 'state', 'labels', 'assignees', 'milestone')
+# Stop collecting validation messages after this many (they are still counted)
+MAX_REPORTED_ERRORS = 1000
+
+def validate_issue(issue):
+    """Return a list of problems with a batch item (empty if it is valid)"""
+    if not isinstance(issue, dict):
+        return ["Issue must be a JSON object"]
+    errors = []
+
+    if 'template_error' in issue:
+        # The title or description it would have rendered is missing too; that's the one problem
+        return [f"Template: {issue['template_error']}"]
+    if 'vars' in issue and not isinstance(issue['vars'], dict):
+        errors.append("Vars must be an object of template variables")
+
+    # An item with a number updates that issue, so it only needs the fields it changes
+    updating = 'number' in issue
+    if updating:
+        number = issue['number']
+        if isinstance(number, bool) or not isinstance(number, int) or number < 1:
+            errors.append("Number must be the number of an existing issue")
+        if not any(field in issue for field in UPDATABLE_FIELDS):
+            errors.append("Nothing to update: set " + ", ".join(UPDATABLE_FIELDS[:-1])
+                          + f" or {UPDATABLE_FIELDS[-1]}")
+        if 'state' in issue and issue['state'] not in ISSUE_STATES:
+            errors.append("State must be 'open' or 'closed'")
+        if 'repos' in issue:
+            errors.append("An issue number belongs to one repository; use 'repo', not 'repos'")
+
+    title = issue.get('title')
+    if 'title' not in issue:
+        if not updating:
+            errors.append("Missing title")
+    elif not isinstance(title, str) or not title.strip():
+        errors.append("Title must be a non-empty string")
+    elif len(title) > MAX_TITLE_LENGTH:
+        errors.append(f"Title is {len(title)} characters (GitHub allows {MAX_TITLE_LENGTH})")
+
+    description = issue.get('description')
+    if 'description' not in issue:
+        if not updating:
+            errors.append("Missing description")
+    elif not isinstance(description, str):
+        errors.append("Description must be a string")
+    elif len(description) > MAX_BODY_LENGTH:
+        errors.append(f"Description is {len(description)} characters (GitHub allows {MAX_BODY_LENGTH})")
+
+    if 'labels' in issue:
+        labels = issue['labels']
+        if not isinstance(labels, list):
+            errors.append("Labels must be a list of names")
+        else:
+            for label in labels:
+                if not isinstance(label, str) or not label.strip():
+                    errors.append(f"Invalid label {label!r}: must be a non-empty string")
+                elif len(label) > MAX_LABEL_LENGTH:
+                    errors.append(f"Label '{label[:20]}...' is longer than {MAX_LABEL_LENGTH} characters")
+
+    if 'assignees' in issue:
+        assignees = issue['assignees']
+        if not isinstance(assignees, list):
+            errors.append("Assignees must be a list of GitHub usernames")
+        else:
+            if len(assignees) > MAX_ASSIGNEES:
+                errors.append(f"Too many assignees ({len(assignees)}, GitHub allows {MAX_ASSIGNEES})")
+            for login in assignees:
+                if not isinstance(login, str) or not GITHUB_LOGIN.match(login):
+                    errors.append(f"Invalid assignee {login!r}: not a valid GitHub username")
+
+    if 'milestone' in issue and not (updating and issue['milestone'] is None):  # null removes it
+        milestone = issue['milestone']
+        if isinstance(milestone, bool) or not isinstance(milestone, (int, str)) or milestone == '':
+            errors.append("Milestone must be a milestone number or title")
+
+    if 'repo' in issue and 'repos' in issue:
+        errors.append("Use either 'repo' or 'repos', not both")
+    repos = issue.get('repos', [issue['repo']] if 'repo' in issue else [])
+    if not isinstance(repos, list) or ('repos' in issue and not repos):
+        errors.append("Repos must be a non-empty list of repositories")
+    else:
+        for name in repos:
+            try:
+                parse_github_url(name)
+            except (ValueError, AttributeError, TypeError):
+                errors.append(f"Invalid repository {name!r}")
+
+    return errors
+
+def issue_targets(issue, default=None):
+    """Return the (owner, repo) pairs a batch item should be created in
+
+    An item may name its own target with 'repo' or several with 'repos';
+    otherwise it goes to the default repository (if any).
+    """
+    if 'repos' in issue:
+        return [parse_github_url(name) for name in issue['repos']]
+    if 'repo' in issue:
+        return [parse_github_url(issue['repo'])]
+    return [default] if default else []
+
+def validate_batch(batch_file, default_repo=None, template=None):
+    """Check every item of a batch file before anything is sent
+
+    Streams the file, so it works on inputs of any size. Returns the number
+    of items, the number of invalid items, up to MAX_REPORTED_ERRORS
+    (index, line, message) tuples, how many issues each target repository
+    will get, the label names and milestones used per repository
+    ("owner/repo" -> {'labels': {lower-cased name: name}, 'milestones': set})
+    and the existing issues items update ("owner/repo" -> set of numbers).
+    Raises BatchFileError if the file itself can't be parsed.
+    """
+    count = 0
+    invalid = 0
+    errors = []
+    targets = {}  # "owner/repo" -> number of issues
+    triage = {}
+    updates = {}
+    for count, (line_number, issue) in enumerate(iter_batch_issues(batch_file, template), 1):
+        problems = validate_issue(issue)
+        if not problems:
+            repos = issue_targets(issue, default_repo)
+            if not repos:
+                problems = ["No target repository: give a repo_url or a 'repo' field"]
+            for owner, repo in repos:
+                name = f"{owner}/{repo}"
+                if 'number' in issue:
+                    numbers = updates.setdefault(name, set())
+                    if issue['number'] in numbers:
+                        problems.append(f"Issue #{issue['number']} in {name} is already updated by an earlier item")
+                        continue
+                    numbers.add(issue['number'])
+                targets[name] = targets.get(name, 0) + 1
+                if issue.get('labels') or issue.get('milestone') is not None:
+                    used = triage.setdefault(name, {'labels': {}, 'milestones': set()})
+                    for label in issue.get('labels', ()):
+                        used['labels'].setdefault(label.lower(), label)
+                    if issue.get('milestone') is not None:
+                        used['milestones'].add(issue['milestone'])
+        if problems:
+            invalid += 1
+            for problem in problems:
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append((count, line_number, problem))
+    return count, invalid, errors, targets, triage, updates
+
+def print_validation_errors(invalid, errors):
+    print(f"❌ Found problems in {invalid} issue(s); nothing was sent:")
+    for index, line_number, message in errors:
+        print(f"   Issue {index} (line {line_number}): {message}")
+    if len(errors) >= MAX_REPORTED_ERRORS:
+        print(f"   ... only the first {MAX_REPORTED_ERRORS} problems are shown")
+
+def normalize_title(title):
+    """Case- and whitespace-insensitive form of an issue title"""
+    return ' '.join(str(title).casefold().split())
+
+def body_hash(body):
+    return hashlib.sha256(' '.join(str(body or '').split()).encode('utf-8')).hexdigest()
+
+class DuplicateIndex:
+    """Normalized titles and body hashes of issues that already exist
+
+    Built once from the repository's issue list so every batch item can be
+    checked with a dictionary lookup instead of a search API call. Items are
+    added as they are scheduled, which also catches repeats within a batch.
+    """
+
+    def __init__(self):
+        self.titles = {}  # normalized title -> [(reference, body hash), ...]
+
+    def add(self, title, body, reference):
+        self.titles.setdefault(normalize_title(title), []).append((reference, body_hash(body)))
+
+    def find(self, title, body):
+        """Return (reference, same body?) for an existing issue with this title, or None"""
+        matches = self.titles.get(normalize_title(title))
+        if not matches:
+            return None
+        digest = body_hash(body)
+        for reference, existing in matches:
+            if existing == digest:
+                return reference, True
+        return matches[0][0], False
+
+    @classmethod
+    def fetch(cls, client, owner, repo, state='open'):
+        """Index every issue (not pull request) of a repository"""
+        index = cls()
+        for issue in client.paginate(f"/repos/{owner}/{repo}/issues", {"state": state}):
+            if 'pull_request' not in issue:
+                index.add(issue['title'], issue.get('body'), f"#{issue['number']}")
+        return index
+
+async def run_concurrently_async(jobs, worker, concurrency=1, ordered=False):
+    """asyncio version of run_concurrently for coroutine workers
+
+    A semaphore keeps at most `concurrency` workers running while a small
+    window of jobs is pulled ahead; results are yielded as an async
+    generator. Cancelling the consumer (e.g. Ctrl+C) cancels every task.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(job):
+        async with semaphore:
+            return await worker(job)
+
+    jobs = iter(jobs)
+    window = concurrency * 2
+    pending = {}   # task -> position in input
+    finished = {}  # position -> result, waiting for its turn (ordered mode)
+    submitted = 0
+    next_to_yield = 0
+    exhausted = False
+    error = None
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(finished) < window:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                except Exception as e:
+                    error = e
+                    exhausted = True
+                    break
+                pending[asyncio.ensure_future(limited(job))] = submitted
+                submitted += 1
+
+            if not pending:
+                if error is not None:
+                    raise error
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position = pending.pop(task)
+                if ordered:
+                    finished[position] = task.result()
+                else:
+                    yield task.result()
+
+            while next_to_yield in finished:
+                yield finished.pop(next_to_yield)
+                next_to_yield += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+def chunked(iterable, size):
+    """Yield lists of up to `size` consecutive items"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def issue_key(owner, repo, issue):
+    """Content hash identifying a batch item and the repository it targets"""
+    content = json.dumps([f"{owner}/{repo}", issue.get('title'), issue.get('description')],
+                         ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+class BatchJournal:
+    """Append-only JSON Lines record of the issues a batch has created
+
+    Every created issue is written (and flushed) as soon as GitHub confirms
+    it, so an interrupted run can be resumed without creating duplicates.
+    Entries are keyed by issue_key(); identical items are counted so each
+    copy is only skipped as many times as it was actually created.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.created = {}  # key -> number of times created
+        self.file = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Read the keys of previously created issues"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        key = json.loads(line)['key']
+                    except (ValueError, KeyError, TypeError):
+                        continue  # e.g. a line cut short when the last run died
+                    self.created[key] = self.created.get(key, 0) + 1
+        except FileNotFoundError:
+            pass
+        return self
+
+    def skipper(self):
+        """Return a function telling whether the next item with a key was already created"""
+        remaining = dict(self.created)
+
+        def already_created(key):
+            if remaining.get(key, 0) > 0:
+                remaining[key] -= 1
+                return True
+            return False
+        return already_created
+
+    def record(self, key, repo, index, number, url):
+        entry = {"key": key, "repo": repo, "index": index, "number": number, "url": url,
+                 "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a', encoding='utf-8')
+            self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+def default_journal_path(batch_file):
+    return f"{batch_file}.journal.jsonl"
+
+OUTPUT_MODES = ('progress', 'verbose', 'quiet')
+
+class ProgressDisplay:
+    """Status line for a running batch, redrawn at a fixed rate
+
+    A background thread does the drawing, so the send loop only bumps
+    counters and never waits on the terminal. On a terminal the line is
+    rewritten in place a few times a second and anything else printed
+    meanwhile appears above it; otherwise (CI logs, pipes) a status line
+    is printed every PLAIN_INTERVAL seconds. `counts` returns the current
+    (created, failed, skipped) totals.
+    """
+
+    TTY_INTERVAL = 0.25
+    PLAIN_INTERVAL = 10.0
+
+    def __init__(self, total, counts, stream=None):
+        self.total = total
+        self.counts = counts
+        self.stream = stream or sys.stdout
+        self.tty = self.stream.isatty()
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.shown = False
+        self.thread = None
+
+    def line(self):
+        created, failed, skipped = self.counts()
+        done = created + failed + skipped
+        elapsed = time.monotonic() - self.started
+        rate = (created + failed) / elapsed if elapsed > 0 else 0.0
+        if rate > 0 and done < self.total:
+            eta = int((self.total - done) / rate)
+            eta = f"{eta // 3600}h{eta // 60 % 60:02d}m" if eta >= 3600 else f"{eta // 60}m{eta % 60:02d}s"
+        else:
+            eta = "--"
+        line = (f"📊 {done}/{self.total} ({done / max(self.total, 1):.0%}) | ✅ {created} ❌ {failed}"
+                + (f" ⏭️  {skipped}" if skipped else "") + f" | {rate:.1f}/s | ETA {eta}")
+        return line
+
+    def draw(self):
+        with self.lock:
+            if self.tty:
+                self.stream.write('\r\033[K' + self.line())
+                self.shown = True
+            else:
+                self.stream.write(self.line() + '\n')
+            self.stream.flush()
+
+    def _run(self):
+        interval = self.TTY_INTERVAL if self.tty else self.PLAIN_INTERVAL
+        while not self.stopped.wait(interval):
+            self.draw()
+
+    # While running, the display stands in for sys.stdout so other output
+    # doesn't get mixed into the status line
+    def write(self, text):
+        with self.lock:
+            if self.shown:
+                self.stream.write('\r\033[K')
+                self.shown = False
+            return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    def __enter__(self):
+        if self.tty:
+            sys.stdout = self
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        if self.tty:
+            sys.stdout = self.stream
+            self.stream.write('\r\033[K')
+        self.stream.write(self.line() + '\n')
+        self.stream.flush()
+
+def run_concurrently(jobs, worker, concurrency=1, ordered=False):
+    """Run worker over jobs with at most `concurrency` in flight, yielding results
+
+    Jobs are pulled from the iterable lazily so only a small window is ever
+    queued. With ordered=True results are yielded in input order, otherwise
+    as soon as each one completes.
+    """
+    if concurrency <= 1:
+        for job in jobs:
+            yield worker(job)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    jobs = iter(jobs)
+    window = concurrency * 2
+    pending = {}   # future -> position in input
+    finished = {}  # position -> result, waiting for its turn (ordered mode)
+    submitted = 0
+    next_to_yield = 0
+    exhausted = False
+    error = None
+
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        while True:
+            while not exhausted and len(pending) + len(finished) < window:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                except Exception as e:
+                    # Finish and report what is already in flight, then re-raise
+                    error = e
+                    exhausted = True
+                    break
+                pending[pool.submit(worker, job)] = submitted
+                submitted += 1
+
+            if not pending:
+                if error is not None:
+                    raise error
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = pending.pop(future)
+                if ordered:
+                    finished[position] = future.result()
+                else:
+                    yield future.result()
+
+            while next_to_yield in finished:
+                yield finished.pop(next_to_yield)
+                next_to_yield += 1
+    finally:
+        # Drop anything not started yet (e.g. on Ctrl+C) instead of draining the queue,
+        # and wake workers sleeping out a pause, which may last until the rate-limit reset
+        for future in pending:
+            future.cancel()
+        if pending:
+            _stopping.set()
+        try:
+            pool.shutdown(wait=True)
+        finally:
+            _stopping.clear()
+
+def prepare_triage(client, triage, concurrency=1):
+    """Look up the labels and milestones a batch uses, creating missing labels
+
+    Runs once before the first issue is sent, so applying labels and
+    milestones costs no extra request per issue. Returns
+    {"owner/repo": RepoMetadata}. Exits without sending anything if a
+    milestone doesn't exist or the lookups fail.
+    """
+    import requests
+    metadata = {}
+    missing_milestones = []
     try:
-        with open(batch_file, 'r') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Error: Batch file '{batch_file}' not found")
+        for name, used in sorted(triage.items()):
+            owner, repo = name.split('/', 1)
+            metadata[name] = client.repo_metadata(owner, repo)
+            missing = [label for key, label in used['labels'].items() if metadata[name].label(key) is None]
+            if missing:
+                created = run_concurrently(missing, lambda label: client.create_label(owner, repo, label),
+                                           concurrency)
+                for label in created:
+                    metadata[name].add_label(label)
+                print(f"🏷️  Created {len(missing)} missing label(s) in {name}: {', '.join(missing)}")
+            missing_milestones += [(name, milestone) for milestone in used['milestones']
+                                   if metadata[name].milestone(milestone) is None]
+    except (GitHubAPIError, GitHubAuthError, requests.RequestException) as e:
+        print(f"❌ Error: Could not prepare labels and milestones: {e}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in batch file: {e}")
+    if missing_milestones:
+        print("❌ These milestones don't exist; nothing was sent:")
+        for name, milestone in missing_milestones:
+            print(f"   {name}: {milestone!r}")
         sys.exit(1)
-    
-    if 'issues' not in data:
-        print("❌ Error: Batch file must contain an 'issues' array")
+    return metadata
+
+# Batches updating up to this many issues per repo read them one by one; bigger
+# ones list the repo's issues (100 per request) if that takes fewer requests
+MAX_SINGLE_LOOKUPS = 100
+
+def issue_snapshot(issue):
+    """The parts of a GitHub issue that issue_changes compares"""
+    return {
+        "number": issue['number'],
+        "title": issue['title'],
+        "body": issue.get('body') or '',
+        "state": issue['state'],
+        "labels": [{"name": label['name']} for label in issue.get('labels') or []],
+        "assignees": [{"login": user['login']} for user in issue.get('assignees') or []],
+        "milestone": {"number": issue['milestone']['number']} if issue.get('milestone') else None,
+        "html_url": issue['html_url'],
+    }
+
+def fetch_current_issues(client, updates, concurrency=1):
+    """Current state of the issues a batch updates: {"owner/repo": {number: snapshot}}
+
+    Runs once before the first issue is sent. Each request is a GET, so
+    re-applying a batch to issues that haven't changed is answered from the
+    ETag cache. Issues are read one by one unless listing the whole repo
+    takes fewer requests. Exits without sending anything if the lookups fail.
+    """
+    import requests
+    current = {}
+    listing = {"state": "all", "sort": "created", "direction": "asc"}
+    try:
+        for name, numbers in sorted(updates.items()):
+            owner, repo = name.split('/', 1)
+            found = current[name] = {}
+            pages = None
+            if len(numbers) > MAX_SINGLE_LOOKUPS:
+                pages = client.page_count(f"/repos/{owner}/{repo}/issues", listing)
+            if pages is None or pages >= len(numbers):
+                def get(number):
+                    response = client.request('GET', f"/repos/{owner}/{repo}/issues/{number}")
+                    if response.status_code == 200:
+                        return response.json()
+                    if response.status_code in (404, 410):
+                        return None  # reported as a failure of that item
+                    raise GitHubAPIError(response)
+                issues = (issue for issue in run_concurrently(sorted(numbers), get, concurrency) if issue)
+            else:
+                listed = client.paginate_pages(f"/repos/{owner}/{repo}/issues", listing, concurrency)
+                issues = (issue for page in listed for issue in page if issue['number'] in numbers)
+            for issue in issues:
+                found[issue['number']] = issue_snapshot(issue)
+    except (GitHubAPIError, GitHubAuthError, requests.RequestException) as e:
+        print(f"❌ Error: Could not read the issues to update: {e}")
+        sys.exit(1)
+    return current
+
+def issue_changes(issue, current, metadata=None):
+    """PATCH fields that turn `current` (an issue snapshot) into the batch item `issue`
+
+    Only fields the item sets and that differ are included, so an item that
+    already matches gives {} and costs no request. Labels and assignees
+    compare as sets, ignoring case like GitHub; an empty list clears them
+    and a null milestone removes it.
+    """
+    changes = {}
+    if 'title' in issue and issue['title'] != current['title']:
+        changes['title'] = issue['title']
+    if 'description' in issue and issue['description'] != current['body']:
+        changes['body'] = issue['description']
+    if 'state' in issue and issue['state'] != current['state']:
+        changes['state'] = issue['state']
+    if 'labels' in issue:
+        labels = [metadata.label(name)['name'] for name in issue['labels']]
+        if {name.lower() for name in labels} != {label['name'].lower() for label in current['labels']}:
+            changes['labels'] = labels
+    if 'assignees' in issue:
+        if ({login.lower() for login in issue['assignees']}
+                != {user['login'].lower() for user in current['assignees']}):
+            changes['assignees'] = list(issue['assignees'])
+    if 'milestone' in issue:
+        milestone = issue['milestone']
+        if milestone is not None:
+            milestone = metadata.milestone(milestone)['number']
+        if milestone != (current['milestone'] or {}).get('number'):
+            changes['milestone'] = milestone
+    return changes
+
+def create_batch_issues(owner, repo, batch_file, token, concurrency=1, ordered=False,
+                        client=None, journal_path=None, resume=False, duplicates=None,
+                        dry_run=False, transport='sync', graphql_chunk=DEFAULT_GRAPHQL_CHUNK,
+                        output='verbose', results_path=None, template=None, validation=None):
+    """Create multiple issues from a JSON, JSON Lines or CSV batch file
+
+    owner/repo is the default target; items may name their own with 'repo'
+    or fan out to several with 'repos' (owner may then be None). All targets
+    share one client, connection pool and rate-limit budget.
+
+    The whole file is validated before any request is made; dry_run=True
+    stops after that. A caller that already ran validate_batch on the same
+    file (like the wizard) passes its result as `validation` so a big file
+    isn't read an extra time. Created issues are recorded in a journal (by default
+    next to the batch file); with resume=True items already in the journal
+    are skipped. duplicates='skip' or 'flag' checks every item against the
+    repository's open issues (and earlier items of the batch) before sending it.
+    transport='async' sends the issues with asyncio/httpx instead of threads;
+    transport='graphql' creates `graphql_chunk` issues per request and falls
+    back to REST for any issue the mutation could not create.
+    output='verbose' prints every issue as it is created, 'progress' keeps a
+    single status line (plus failures) and 'quiet' prints only the summary;
+    results_path names a JSON Lines file that gets every issue's outcome.
+    template (a BatchTemplate) renders titles and descriptions from each
+    item's vars as the file streams; headers in the file build on it.
+
+    Items with a 'number' update that existing issue instead. The current
+    state of every such issue is read up front and only the fields that
+    differ are PATCHed, through the same workers and rate limiter; an item
+    that already matches its issue sends nothing.
+    """
+    if not os.path.isfile(batch_file):
+        print(f"❌ Error: Batch file '{batch_file}' not found")
         sys.exit(1)
+    default_repo = (owner, repo) if owner else None
+    quiet = output == 'quiet'
     
-    issues = data['issues']
-    total_issues = len(issues)
+    def info(*args):
+        """Print progress chatter (everything but errors and the summary) unless quiet"""
+        if not quiet:
+            print(*args)
     
-    if total_issues == 0:
+    if validation is None:
+        info(f"🔍 Validating '{batch_file}'...")
+        try:
+            validation = validate_batch(batch_file, default_repo, template)
+        except (BatchFileError, UnicodeDecodeError) as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+    item_count, invalid, errors, targets, triage, updates = validation
+    if item_count == 0:
         print("❌ No issues found in batch file")
         sys.exit(1)
+    if invalid:
+        print_validation_errors(invalid, errors)
+        sys.exit(1)
+    total_issues = sum(targets.values())
+    total_updates = sum(len(numbers) for numbers in updates.values())
+    fan_out = len(targets) > 1 or default_repo is None
+    info(f"✅ All {item_count} issues are valid")
+    if dry_run:
+        print("🧪 Dry run: no issues were created")
+        return
     
-    print(f"🚀 Creating {total_issues} issues in {owner}/{repo}")
-    print("=" * 50)
+    journal = BatchJournal(journal_path or default_journal_path(batch_file))
+    if resume:
+        journal.load()
+    already_created = journal.skipper()
     
-    successful = 0
-    failed = 0
+    if total_updates == total_issues:
+        action = f"Updating {total_issues} issues"
+    elif total_updates:
+        action = f"Creating {total_issues - total_updates} and updating {total_updates} issues"
+    else:
+        action = f"Creating {total_issues} issues"
+    if len(targets) > 1:
+        info(f"\n🚀 {action} across {len(targets)} repositories")
+    else:
+        info(f"\n🚀 {action} in {next(iter(targets))}")
+    if transport == 'async':
+        _import_httpx()
+        info(f"⚡ Using the async transport with up to {concurrency} requests in flight")
+    elif transport == 'graphql':
+        info(f"⚡ Using GraphQL with {graphql_chunk} issues per request"
+              + (f" and {concurrency} parallel workers" if concurrency > 1 else ""))
+    elif concurrency > 1:
+        info(f"⚡ Using {concurrency} parallel workers")
+    if resume:
+        info(f"📒 Resuming: {sum(journal.created.values())} issues already recorded in '{journal.path}'")
+    info("=" * 50)
+    
+    client = client or GitHubClient(token, pool_size=concurrency, cache=ResponseCache())
+    metadata = prepare_triage(client, triage, concurrency) if triage else {}
+    current = fetch_current_issues(client, updates, concurrency) if updates else {}
+    for name, found in sorted(current.items()):
+        info(f"🔎 Read the current state of {len(found)} issue(s) to update in {name}")
+    
+    duplicate_indexes = {}  # "owner/repo" -> DuplicateIndex, fetched on first use
+    
+    def duplicate_index(target_owner, target_repo):
+        name = f"{target_owner}/{target_repo}"
+        if name not in duplicate_indexes:
+            import requests
+            try:
+                index = DuplicateIndex.fetch(client, target_owner, target_repo)
+            except (GitHubAPIError, GitHubAuthError, requests.RequestException) as e:
+                print(f"❌ Error: Could not list existing issues in {name} for duplicate checks: {e}")
+                sys.exit(1)
+            info(f"🔎 Indexed {sum(len(m) for m in index.titles.values())} open issues in {name} "
+                  f"for duplicate checks")
+            duplicate_indexes[name] = index
+        return duplicate_indexes[name]
+    
+    def new_result(job):
+        title = job['issue'].get('title')
+        if job['changes'] is not None and title is None:
+            # An update that leaves the title alone
+            title = job['current']['title'] if job['current'] else f"#{job['issue']['number']}"
+        result = {'index': job['index'], 'line': job['line'], 'repo': job['repo'],
+                  'title': title, 'ok': False, 'duplicate_of': job['duplicate_of']}
+        if job['changes'] is not None:
+            result['update'] = True
+            result['number'] = job['issue']['number']
+        return result
+    
+    def record_created(job, result, number, url):
+        result['ok'] = True
+        result['number'] = number
+        result['url'] = url
+        # Journal from the worker so in-flight issues are recorded even on Ctrl+C
+        journal.record(job['key'], job['repo'], job['index'], number, url)
+    
+    def record_response(job, result, response):
+        """Fill in a result from GitHub's REST answer (same for both transports)"""
+        result['throttled'] = response.throttled
+        result['retries'] = response.retries
+        result['recovered'] = getattr(response, 'recovered', False)
+        if response.status_code == 201:
+            issue_data = response.json()
+            record_created(job, result, issue_data['number'], issue_data['html_url'])
+        else:
+            result['status'] = response.status_code
+            result['error'] = response.json().get('message', 'Unknown error')
+    
+    def record_update(job, result, response):
+        """Fill in a result from GitHub's answer to a PATCH (same for both transports)"""
+        result['throttled'] = response.throttled
+        result['retries'] = response.retries
+        if response.status_code == 200:
+            result['ok'] = True
+            result['url'] = response.json()['html_url']
+            result['updated'] = sorted(job['changes'])
+        else:
+            result['status'] = response.status_code
+            result['error'] = response.json().get('message', 'Unknown error')
     
-    for i, issue in enumerate(issues, 1):
+    def send(job):
+        """Create (or update) a single batch issue and describe the outcome"""
+        result = new_result(job)
+        issue = job['issue']
         try:
-            # Validate required fields
-            if 'title' not in issue or 'description' not in issue:
-                print(f"❌ Issue {i}: Missing title or description")
-                failed += 1
-                continue
-            
-            title = issue['title']
-            description = issue['description']
-            
-            print(f"📝 Creating issue {i}/{total_issues}: {title[:50]}...")
-            
-            # Create the issue
-            url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/vnd.github+json"
-            }
-            data = {
-                "title": title,
-                "body": description
-            }
-            
-            response = requests.post(url, headers=headers, json=data)
-            
-            if response.status_code == 201:
-                issue_data = response.json()
-                print(f"✅ Issue #{issue_data['number']}: {title}")
-                print(f"   🔗 {issue_data['html_url']}")
-                successful += 1
+            if job['changes'] is not None:
+                response = client.update_issue(*job['target'], issue['number'], job['changes'])
+                record_update(job, result, response)
             else:
-                print(f"❌ Failed to create issue: {response.status_code}")
-                print(f"   Error: {response.json().get('message', 'Unknown error')}")
-                failed += 1
-            
-            # Small delay to avoid rate limiting
-            import time
-            time.sleep(0.5)
-            
+                response = client.create_issue(*job['target'], issue['title'], issue['description'],
+                                               job['fields'])
+                record_response(job, result, response)
+        except Exception as e:
+            result['error'] = f"Error - {e}"
+        return result
+    
+    def send_chunk(chunk):
+        """Create a chunk of issues with one GraphQL request, REST for the leftovers"""
+        if any(job['changes'] is not None for job in chunk):
+            # Updates are PATCHed over REST; create the rest of the chunk as usual
+            updates = [send(job) for job in chunk if job['changes'] is not None]
+            chunk = [job for job in chunk if job['changes'] is None]
+            return updates + (send_chunk(chunk) if chunk else [])
+        try:
+            outcomes = client.create_issues_graphql(
+                [(*job['target'], job['issue']['title'], job['issue']['description'], job['fields'])
+                 for job in chunk])
+        except GitHubAPIError as e:
+            if e.status_code < 500:
+                # Rejected outright, so nothing was created: send every issue over REST
+                outcomes = [f"GraphQL request rejected ({e})"] * len(chunk)
+            else:
+                return [dict(new_result(job), error=f"GraphQL request failed - {e}") for job in chunk]
         except Exception as e:
-            print(f"❌ Issue {i}: Error - {e}")
+            return [dict(new_result(job), error=f"Error - {e}") for job in chunk]
+        
+        results = []
+        for job, outcome in zip(chunk, outcomes):
+            if isinstance(outcome, dict):
+                result = new_result(job)
+                if 'number' in outcome:
+                    result['recovered'] = outcome.get('recovered', False)
+                    record_created(job, result, outcome['number'], outcome['url'])
+                else:
+                    # It may exist, so sending it again could create it twice
+                    result['error'] = f"GraphQL request failed - {outcome['error']}"
+            else:
+                result = send(job)
+                result['graphql_error'] = outcome
+            results.append(result)
+        return results
+    
+    async def send_async(async_client, job):
+        result = new_result(job)
+        issue = job['issue']
+        try:
+            if job['changes'] is not None:
+                response = await async_client.update_issue(*job['target'], issue['number'],
+                                                           job['changes'])
+                record_update(job, result, response)
+            else:
+                response = await async_client.create_issue(*job['target'], issue['title'],
+                                                           issue['description'], job['fields'])
+                record_response(job, result, response)
+        except Exception as e:
+            result['error'] = f"Error - {e}"
+        return result
+    
+    # Per-repository tallies: "owner/repo" -> {'created', 'failed', 'skipped'}
+    per_repo = {name: {'created': 0, 'failed': 0, 'skipped': 0} for name in targets}
+    skipped = 0
+    skipped_duplicates = 0
+    
+    def jobs():
+        nonlocal skipped, skipped_duplicates
+        for i, (line_number, issue) in enumerate(iter_batch_issues(batch_file, template), 1):
+            for target in issue_targets(issue, default_repo):
+                name = f"{target[0]}/{target[1]}"
+                if 'number' in issue:
+                    # Updates aren't journaled: re-running one finds nothing left to change
+                    job = {'index': i, 'line': line_number, 'issue': issue, 'target': target,
+                           'repo': name, 'duplicate_of': None, 'changes': {},
+                           'current': current[name].get(issue['number'])}
+                    if job['current'] is None:
+                        report(dict(new_result(job), status=404,
+                                    error=f"Issue #{issue['number']} not found in {name}"))
+                        continue
+                    job['changes'] = issue_changes(issue, job['current'], metadata.get(name))
+                    if not job['changes']:
+                        report(dict(new_result(job), ok=True, url=job['current']['html_url'],
+                                    unchanged=True))
+                        continue
+                    yield job
+                    continue
+                key = issue_key(target[0], target[1], issue)
+                if already_created(key):
+                    write_result({'index': i, 'line': line_number, 'repo': name,
+                                  'title': issue['title'], 'ok': False, 'skipped': "already created"})
+                    skipped += 1
+                    per_repo[name]['skipped'] += 1
+                    continue
+                duplicate_of = None
+                if duplicates:
+                    index = duplicate_index(*target)
+                    match = index.find(issue['title'], issue.get('description'))
+                    if match is None:
+                        index.add(issue['title'], issue.get('description'), f"item {i}")
+                    else:
+                        duplicate_of = match[0] + (" (same title and body)" if match[1] else " (same title)")
+                        if duplicates == 'skip':
+                            where = f" in {name}" if fan_out else ""
+                            if output == 'verbose':
+                                print(f"⏭️  Issue {i}{where}: duplicate of {duplicate_of}, skipping")
+                            write_result({'index': i, 'line': line_number, 'repo': name,
+                                          'title': issue['title'], 'ok': False,
+                                          'skipped': f"duplicate of {duplicate_of}"})
+                            skipped_duplicates += 1
+                            per_repo[name]['skipped'] += 1
+                            continue
+                yield {'index': i, 'line': line_number, 'issue': issue, 'key': key,
+                       'target': target, 'repo': name, 'duplicate_of': duplicate_of,
+                       'fields': triage_fields(issue, metadata.get(name)), 'changes': None}
+    
+    successful = 0
+    failed = 0
+    updated = 0
+    unchanged = 0
+    read_error = None
+    interrupted = False
+    
+    results_file = open(results_path, 'w', encoding='utf-8', buffering=1024 * 1024) if results_path else None
+    
+    def write_result(result):
+        if results_file is not None:
+            results_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+    
+    def report(result):
+        nonlocal successful, failed, updated, unchanged
+        write_result(result)
+        if result['ok']:
+            successful += 1
+            per_repo[result['repo']]['created'] += 1
+            if 'updated' in result:
+                updated += 1
+            elif result.get('unchanged'):
+                unchanged += 1
+        else:
             failed += 1
+            per_repo[result['repo']]['failed'] += 1
+        if output == 'verbose':
+            print_result(result)
+        elif output == 'progress' and not result['ok']:
+            where = f" in {result['repo']}" if fan_out else ""
+            status = f"{result['status']} " if 'status' in result else ""
+            print(f"❌ Issue {result['index']}{where} (line {result['line']}): {status}{result['error']}")
+    
+    def print_result(result):
+        i = result['index']
+        title = result['title']
+        where = f" in {result['repo']}" if fan_out else ""
+        if result.get('update'):
+            print_update(result, where)
+            return
+        print(f"📝 Creating issue {i}/{item_count}{where}: {title[:50]}...")
+        if result.get('throttled'):
+            print(f"   ⏳ Rate limited {result['throttled']} time(s), retried")
+        if result.get('retries'):
+            print(f"   🔁 Retried {result['retries']} time(s) after transient errors")
+        if result.get('recovered'):
+            print("   ♻️  GitHub had created it despite the error; not sent again")
+        if result.get('graphql_error'):
+            print(f"   ↩️  Sent over REST after GraphQL error: {result['graphql_error']}")
+        
+        if result['ok']:
+            print(f"✅ Issue #{result['number']}: {title}")
+            print(f"   🔗 {result['url']}")
+            if result['duplicate_of']:
+                print(f"   ⚠️  Possible duplicate of {result['duplicate_of']}")
+        elif 'status' in result:
+            print(f"❌ Failed to create issue: {result['status']}")
+            print(f"   Error: {result['error']}")
+        else:
+            print(f"❌ Issue {i} (line {result['line']}): {result['error']}")
+    
+    def print_update(result, where):
+        number = result['number']
+        print(f"✏️  Updating issue #{number} ({result['index']}/{item_count}){where}: {result['title'][:50]}...")
+        if result.get('throttled'):
+            print(f"   ⏳ Rate limited {result['throttled']} time(s), retried")
+        if result.get('retries'):
+            print(f"   🔁 Retried {result['retries']} time(s) after transient errors")
+        if result.get('unchanged'):
+            print(f"➖ Issue #{number} is already up to date")
+        elif result['ok']:
+            print(f"✅ Issue #{number}: changed {', '.join(result['updated'])}")
+            print(f"   🔗 {result['url']}")
+        else:
+            status = f"{result['status']} " if 'status' in result else ""
+            print(f"❌ Failed to update issue #{number}: {status}{result['error']}")
+    
+    async def send_all_async():
+        async with AsyncGitHubClient(client.token, pool_size=concurrency, api_url=client.api_url,
+                                     metrics=client.metrics, retry=client.retry,
+                                     claimed=client.claimed, tokens=client.tokens) as async_client:
+            async for result in run_concurrently_async(
+                    jobs(), lambda job: send_async(async_client, job), concurrency, ordered):
+                report(result)
+    
+    if output == 'progress':
+        display = ProgressDisplay(total_issues,
+                                  lambda: (successful, failed, skipped + skipped_duplicates))
+    else:
+        display = contextlib.nullcontext()
+    
+    try:
+        with display:
+            if transport == 'async':
+                import asyncio
+                asyncio.run(send_all_async())
+            elif transport == 'graphql':
+                for results in run_concurrently(chunked(jobs(), graphql_chunk), send_chunk,
+                                                concurrency, ordered):
+                    for result in results:
+                        report(result)
+            else:
+                for result in run_concurrently(jobs(), send, concurrency, ordered):
+                    report(result)
+    except (BatchFileError, UnicodeDecodeError) as e:
+        read_error = e
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        journal.close()
+        if results_file is not None:
+            results_file.close()
+    
+    processed = successful + failed + skipped + skipped_duplicates
     
     print("\n" + "=" * 50)
-    print(f"🎉 Batch creation complete!")
+    if read_error is not None:
+        print(f"❌ Error: {read_error}")
+        print("⚠️  Batch stopped early; issues before it were already processed")
+    elif interrupted:
+        print("⚠️  Batch interrupted")
+    else:
+        print(f"🎉 Batch creation complete!")
+    if len(per_repo) > 1:
+        print("📂 Per repository:")
+        width = max(len(name) for name in per_repo)
+        for name, counts in sorted(per_repo.items()):
+            line = f"   {name:<{width}}  ✅ {counts['created']}  ❌ {counts['failed']}"
+            if counts['skipped']:
+                line += f"  ⏭️  {counts['skipped']}"
+            print(line)
     print(f"✅ Successful: {successful}")
+    if updated or unchanged:
+        print(f"   ✏️  Updated: {updated}")
+        print(f"   ➖ Unchanged (nothing sent): {unchanged}")
     print(f"❌ Failed: {failed}")
+    if skipped:
+        print(f"⏭️  Skipped (already created): {skipped}")
+    if skipped_duplicates:
+        print(f"⏭️  Skipped (duplicates): {skipped_duplicates}")
+    if processed < total_issues:
+        print(f"⏸️  Not processed: {total_issues - processed}")
     print(f"📊 Total: {total_issues}")
+    if results_path:
+        print(f"📄 Results written to '{results_path}'")
+    if read_error is not None or interrupted:
+        print("💡 Re-run with --resume to continue without creating duplicates")
+        sys.exit(1)
+
+EXPORT_STATES = ('open', 'closed', 'all')
+
+def default_sync_path(export_file):
+    return f"{export_file}.sync.json"
+
+def export_record(issue):
+    """A GitHub issue as a batch item, plus its number, state, URL and last update"""
+    record = {
+        "number": issue['number'],
+        "state": issue['state'],
+        "title": issue['title'],
+        "description": issue.get('body') or '',
+        "labels": [label['name'] for label in issue.get('labels') or []],
+        "assignees": [user['login'] for user in issue.get('assignees') or []],
+    }
+    if issue.get('milestone'):
+        record['milestone'] = issue['milestone']['title']
+    record['url'] = issue['html_url']
+    record['updated_at'] = issue['updated_at']
+    return record
+
+def export_issues(client, owner, repo, export_file, state='all', concurrency=1, full=False):
+    """Write a repository's issues to export_file as JSON Lines in the batch format
+
+    Pages are fetched `concurrently` at a time and written as they arrive.
+    The newest update seen is saved in <export file>.sync.json; the next
+    export of the same repo asks GitHub only for issues updated since then
+    (with every state, so closed issues leave an 'open' export) and merges
+    them in by number. When nothing changed, the request is the same as
+    last time and GitHub answers with 304 from the ETag cache. `full`
+    ignores the previous sync and fetches everything.
+    """
+    sync_path = default_sync_path(export_file)
+    sync = None
+    if not full and os.path.exists(export_file):
+        try:
+            with open(sync_path, 'r', encoding='utf-8') as f:
+                sync = json.load(f)
+        except (OSError, ValueError):
+            sync = None
+        if not (isinstance(sync, dict) and sync.get('repo') == f"{owner}/{repo}"
+                and sync.get('state') == state and sync.get('since')):
+            sync = None  # a different export; start over
+
+    if sync:
+        print(f"🔄 Fetching issues of {owner}/{repo} updated since {sync['since']}")
+        params = {"state": "all", "since": sync['since'], "sort": "updated", "direction": "asc"}
+        newest = sync['since']
+    else:
+        print(f"📤 Exporting {state} issues of {owner}/{repo} to '{export_file}'")
+        params = {"state": state, "sort": "created", "direction": "asc"}
+        newest = None
+
+    started = time.monotonic()
+    exported = 0
+    changed = {}  # number -> record, merged into the previous export
+    unchanged = 0
+    tmp = f"{export_file}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as out:
+            for page in client.paginate_pages(f"/repos/{owner}/{repo}/issues", params, concurrency):
+                for issue in page:
+                    if 'pull_request' in issue:
+                        continue  # the issues endpoint lists pull requests too
+                    newest = max(newest or issue['updated_at'], issue['updated_at'])
+                    record = export_record(issue)
+                    if sync:
+                        changed[record['number']] = record
+                    else:
+                        out.write(json.dumps(record) + '\n')
+                        exported += 1
+            if sync:
+                with open(export_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        previous = json.loads(line)
+                        if previous.get('number') not in changed:
+                            out.write(line if line.endswith('\n') else line + '\n')
+                            exported += 1
+                        elif changed[previous['number']] == previous:
+                            # `since` is inclusive, so the last update is always fetched again
+                            unchanged += 1
+                for record in changed.values():
+                    if state == 'all' or record['state'] == state:
+                        out.write(json.dumps(record) + '\n')
+                        exported += 1
+        os.replace(tmp, export_file)
+    except (GitHubAPIError, GitHubAuthError, OSError, ValueError) as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    if newest:
+        with open(sync_path, 'w', encoding='utf-8') as f:
+            json.dump({"repo": f"{owner}/{repo}", "state": state, "since": newest}, f)
+    elapsed = time.monotonic() - started
+    if sync:
+        print(f"✅ {len(changed) - unchanged} issues changed; '{export_file}' now has {exported} issues "
+              f"({elapsed:.1f}s)")
+    else:
+        print(f"✅ Exported {exported} issues to '{export_file}' ({elapsed:.1f}s)")
+
+DEFAULT_SERVE_PORT = 8765
+SERVER_ENV = "CREATE_ISSUE_SERVER"
+# Shared secret of a --serve process; by default a random one is kept in server_secret_path()
+SERVER_SECRET_ENV = "CREATE_ISSUE_SERVER_SECRET"
+SERVER_SECRET_HEADER = "X-Create-Issue-Secret"
+
+def parse_server_address(address):
+    """('unix', path) for 'unix:/path' or a path, else ('tcp', (host, port))"""
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if address.startswith(('/', '.')):
+        return 'unix', address
+    hostport = address.split('://', 1)[-1].rstrip('/')
+    host, _, port = hostport.rpartition(':')
+    if not host:
+        host, port = hostport, DEFAULT_SERVE_PORT
+    try:
+        return 'tcp', (host, int(port))
+    except ValueError:
+        raise ValueError(f"Invalid server address: {address}")
+
+def server_secret_path(address):
+    """Where the server listening on `address` keeps its secret for local callers"""
+    kind, target = parse_server_address(address)
+    where = os.path.abspath(target) if kind == 'unix' else str(target[1])
+    key = hashlib.sha256(f"{kind}:{where}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(default_cache_dir(), "serve", key + ".secret")
+
+def server_secret(address):
+    """The secret to send to the server at `address`, or None if it can't be found"""
+    if os.environ.get(SERVER_SECRET_ENV):
+        return os.environ[SERVER_SECRET_ENV]
+    try:
+        with open(server_secret_path(address), 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def request_metadata(client, owner, repo, issue):
+    """RepoMetadata for one issue sent to the server, or None if it needs none
+
+    Like prepare_triage for a single item: missing labels are created, and
+    the cached metadata is fetched again before a milestone is reported
+    missing, since a server outlives the milestones it first saw. Raises
+    ValueError if the milestone doesn't exist.
+    """
+    if not (issue.get('labels') or issue.get('milestone') is not None):
+        return None
+    metadata = client.repo_metadata(owner, repo)
+    if issue.get('milestone') is not None and metadata.milestone(issue['milestone']) is None:
+        metadata = client.repo_metadata(owner, repo, refresh=True)
+        if metadata.milestone(issue['milestone']) is None:
+            raise ValueError(f"Milestone {issue['milestone']!r} doesn't exist in {owner}/{repo}")
+    for name in issue.get('labels') or []:
+        if metadata.label(name) is None:
+            metadata.add_label(client.create_label(owner, repo, name))
+    return metadata
+
+def _issue_request_handler(client, slots, secret):
+    """HTTP handler class creating issues through the shared client"""
+    import hmac
+    from http.server import BaseHTTPRequestHandler
+
+    class IssueRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def address_string(self):
+            # Unix socket peers have no address
+            return self.client_address[0] if isinstance(self.client_address, tuple) else 'local'
+
+        def log_message(self, format, *args):
+            pass
+
+        def reply(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != '/health':
+                return self.reply(404, {"error": "Not found"})
+            self.reply(200, {"ok": True})
+
+        def do_POST(self):
+            if self.path != '/issues':
+                return self.reply(404, {"error": "Not found"})
+            # A web page can POST text/plain to localhost without asking first, but can't
+            # send JSON or a custom header; and only this user can read the secret
+            given = self.headers.get(SERVER_SECRET_HEADER) or ''
+            content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+            if not hmac.compare_digest(given.encode('utf-8'), secret.encode('utf-8')):
+                self.close_connection = True  # the unread body mustn't be taken for a request
+                return self.reply(401, {"error": f"Missing or wrong {SERVER_SECRET_HEADER} header"})
+            if content_type != 'application/json':
+                self.close_connection = True
+                return self.reply(415, {"error": "Content-Type must be application/json"})
+            try:
+                issue = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            except ValueError:
+                return self.reply(400, {"error": "Request body must be JSON"})
+            errors = validate_issue(issue)
+            if not errors and 'repo' not in issue:
+                errors = ["Missing repo"]
+            if not errors and 'vars' in issue:
+                errors = ["The server has no template to render 'vars' with; send the title and description"]
+            if errors:
+                return self.reply(400, {"error": "; ".join(errors)})
+            owner, repo = parse_github_url(issue['repo'])
+            what = issue['title'][:50] if 'title' in issue else f"#{issue['number']}"
+
+            # Requests beyond the pool size wait here, in one queue for every caller
+            with slots:
+                try:
+                    if 'number' in issue:
+                        return self.update(owner, repo, issue, what)
+                    fields = triage_fields(issue, request_metadata(client, owner, repo, issue))
+                    response = client.create_issue(owner, repo, issue['title'], issue['description'],
+                                                   fields)
+                except ValueError as e:
+                    return self.reply(422, {"error": str(e)})
+                except Exception as e:
+                    print(f"❌ {owner}/{repo}: {what} - {e}")
+                    return self.reply(502, {"error": str(e)})
+            if response.status_code == 201:
+                data = response.json()
+                print(f"✅ {owner}/{repo}#{data['number']}: {what}")
+                self.reply(201, {"title": data['title'], "number": data['number'],
+                                 "url": data['html_url']})
+            else:
+                self.failed(owner, repo, what, response)
+
+        def update(self, owner, repo, issue, what):
+            """PATCH the fields of an existing issue that differ from the request"""
+            response = client.request('GET', f"/repos/{owner}/{repo}/issues/{issue['number']}")
+            if response.status_code != 200:
+                return self.failed(owner, repo, what, response)
+            current = issue_snapshot(response.json())
+            changes = issue_changes(issue, current, request_metadata(client, owner, repo, issue))
+            if not changes:
+                return self.reply(200, {"title": current['title'], "number": current['number'],
+                                        "url": current['html_url'], "unchanged": True})
+            response = client.update_issue(owner, repo, issue['number'], changes)
+            if response.status_code != 200:
+                return self.failed(owner, repo, what, response)
+            data = response.json()
+            print(f"✏️  {owner}/{repo}#{data['number']}: changed {', '.join(sorted(changes))}")
+            self.reply(200, {"title": data['title'], "number": data['number'],
+                             "url": data['html_url'], "updated": sorted(changes)})
+
+        def failed(self, owner, repo, what, response):
+            message = response.json().get('message', 'Unknown error')
+            print(f"❌ {owner}/{repo}: {what} - {response.status_code} {message}")
+            self.reply(response.status_code, {"error": message})
+
+    return IssueRequestHandler
+
+def serve(client, concurrency=10, port=DEFAULT_SERVE_PORT, socket_path=None):
+    """Create issues on behalf of thin clients until interrupted
+
+    Listens on localhost:port, or on a Unix socket when socket_path is
+    given, and accepts POST /issues with a JSON issue ('repo', 'title',
+    'description', optionally labels, assignees and milestone). An issue
+    with a 'number' updates that issue like a batch item does. Every request goes through the same client, so callers
+    share one connection pool, rate-limit budget and cache instead of each
+    starting a process and a TLS connection of their own. At most
+    `concurrency` issues are sent to GitHub at once. Stops on Ctrl+C or SIGTERM.
+
+    Requests must carry the server's secret in the X-Create-Issue-Secret
+    header: $CREATE_ISSUE_SERVER_SECRET if set, else a random one written
+    to server_secret_path() (readable only by this user) while it runs.
+    """
+    import secrets
+    import signal
+    import socketserver
+    from http.server import ThreadingHTTPServer
+
+    secret = os.environ.get(SERVER_SECRET_ENV) or secrets.token_urlsafe(32)
+    handler = _issue_request_handler(client, threading.BoundedSemaphore(concurrency), secret)
+    # The default listen backlog of 5 drops connections when many jobs call at once
+    if socket_path:
+        class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+            request_queue_size = 128
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # left over from a server that didn't shut down cleanly
+        old_umask = os.umask(0o177)  # only this user may connect
+        try:
+            server = UnixServer(socket_path, handler)
+        finally:
+            os.umask(old_umask)
+        where = f"unix:{socket_path}"
+    else:
+        class LocalServer(ThreadingHTTPServer):
+            request_queue_size = 128
+        server = LocalServer(('127.0.0.1', port), handler)
+        where = f"http://127.0.0.1:{server.server_address[1]}"
+    secret_path = None
+    if not os.environ.get(SERVER_SECRET_ENV):
+        secret_path = server_secret_path(where)
+        try:
+            private_makedirs(os.path.dirname(secret_path))
+            with open_private(secret_path) as f:
+                f.write(secret.encode('utf-8'))
+        except OSError as e:
+            server.server_close()
+            print(f"❌ Error: Could not write the server secret: {e}")
+            sys.exit(1)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    # Service managers and CI stop daemons with SIGTERM; shut down as cleanly as on Ctrl+C
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"🛰️  Serving issue requests on {where} ({concurrency} at a time)")
+    print(f"💡 Forward to it with: export {SERVER_ENV}={where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+        if secret_path and os.path.exists(secret_path):
+            os.remove(secret_path)
+
+def forward_issue(address, owner, repo, title, body, timeout=300):
+    """Send an issue to a running --serve process; returns (status, payload)
+
+    Uses only the standard library, so forwarding never loads the HTTP stack.
+    The server's secret comes from server_secret().
+    """
+    import http.client
+    import socket
+
+    kind, target = parse_server_address(address)
+    if kind == 'unix':
+        class UnixConnection(http.client.HTTPConnection):
+            def connect(self):
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.settimeout(timeout)
+                self.sock.connect(target)
+        connection = UnixConnection('localhost', timeout=timeout)
+    else:
+        connection = http.client.HTTPConnection(*target, timeout=timeout)
+    headers = {'Content-Type': 'application/json'}
+    secret = server_secret(address)
+    if secret:
+        headers[SERVER_SECRET_HEADER] = secret
+    try:
+        connection.request('POST', '/issues', headers=headers,
+                           body=json.dumps({"repo": f"{owner}/{repo}", "title": title,
+                                            "description": body}).encode('utf-8'))
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'{}')
+    finally:
+        connection.close()
+
+def forward_to_server(address, repo_url, title, body):
+    """Create one issue through a --serve process, printing like create_issue()"""
+    try:
+        owner, repo = parse_github_url(repo_url)
+        status, payload = forward_issue(address, owner, repo, title, body)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"❌ Could not reach the issue server at {address}: {e}")
+        print(f"💡 Start one with: ./create_issue.py --serve   (or unset {SERVER_ENV})")
+        sys.exit(1)
+    if status == 201:
+        print("✅ Issue created successfully!")
+        print(f"📄 Title: {payload['title']}")
+        print(f"🔗 URL: {payload['url']}")
+        print(f"📝 Issue #{payload['number']}")
+    else:
+        print("❌ Failed to create issue:", status)
+        print(payload.get('error', payload))
+        if status == 401:
+            print(f"💡 Run as the user who started the server, or set {SERVER_SECRET_ENV} "
+                  "to the server's secret")
+        sys.exit(1)
+
+# Extensions the wizard offers as batch files
+BATCH_FILE_EXTENSIONS = ('.json', '.jsonl', '.csv')
+# Directories never searched for batch files (hidden directories are skipped too)
+IGNORED_DIRS = frozenset({'node_modules', '__pycache__', 'venv', 'site-packages'})
+# How many files the wizard lists before asking for a narrower search
+MAX_LISTED_FILES = 30
+
+def default_index_path(root):
+    """Where the file index of a directory is kept between runs"""
+    key = hashlib.sha256(os.path.abspath(root).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(default_cache_dir(), "files", key + ".json")
+
+def fuzzy_score(query, path):
+    """How well `query` matches `path` (higher is better), or None if it doesn't
+
+    The query found in the file name ranks first (best at its start), then
+    anywhere in the path, then its characters appearing in order in the file
+    name, with bonuses for consecutive characters and word starts
+    ('bi' → batch-issues.json).
+    """
+    query = query.lower()
+    path = path.lower()
+    name = os.path.basename(path)
+    if query in name:
+        return 2000 - name.index(query) - (len(name) - len(query))
+    if query in path:
+        return 1000 - path.index(query)
+    score, last = 0, None
+    for char in query:
+        at = name.find(char, 0 if last is None else last + 1)
+        if at < 0:
+            return None
+        score += 1
+        if last is not None and at == last + 1:
+            score += 3
+        if at == 0 or name[at - 1] in '-_. ':
+            score += 2
+        last = at
+    return min(score, 999)
+
+class FileIndex:
+    """Files under a directory, for the wizard's batch file search
+
+    Built once with an os.scandir walk at most `max_depth` directories deep,
+    skipping IGNORED_DIRS, hidden directories and anything matched by the
+    root's .gitignore. Every directory's listing is kept with its mtime, so a
+    refresh costs one stat per directory and only rescans the ones where
+    files were added, removed or renamed. With `cache_path` the index is
+    saved after a change and revalidated the same way in the next session.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root='.', max_depth=4, cache_path=None, max_age=2.0):
+        self.root = root
+        self.max_depth = max_depth
+        self.cache_path = cache_path
+        self.max_age = max_age  # seconds a refresh is trusted for
+        self.ignore = self._ignore_patterns()
+        self.dirs = {}  # relative directory ('' for the root) -> mtime, files, subdirs
+        self.checked = None
+        self.listing = None  # flattened file list, rebuilt after a change
+        self._load()
+
+    def _ignore_patterns(self):
+        """Patterns from the root's .gitignore (negations are not supported)"""
+        try:
+            with open(os.path.join(self.root, '.gitignore'), 'r', encoding='utf-8') as f:
+                lines = [line.strip() for line in f]
+        except (OSError, UnicodeDecodeError):
+            return []
+        return [line.strip('/') for line in lines
+                if line and not line.startswith(('#', '!')) and line.strip('/')]
+
+    def _ignored(self, rel, name, is_dir):
+        if is_dir and (name in IGNORED_DIRS or name.startswith('.')):
+            return True
+        return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel, pattern)
+                   for pattern in self.ignore)
+
+    def _list(self, rel, mtime):
+        """Scan one directory; None if it can't be read"""
+        files, subdirs = [], []
+        try:
+            with os.scandir(os.path.join(self.root, rel)) as it:
+                for entry in it:
+                    child = os.path.join(rel, entry.name) if rel else entry.name
+                    try:
+                        # Symlinked directories are not followed, so loops are impossible
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        is_file = not is_dir and entry.is_file()
+                    except OSError:
+                        continue
+                    if (is_dir or is_file) and not self._ignored(child, entry.name, is_dir):
+                        (subdirs if is_dir else files).append(child)
+        except OSError:
+            return None
+        return {"mtime": mtime, "files": sorted(files), "subdirs": sorted(subdirs)}
+
+    def refresh(self):
+        """Bring the index up to date, rescanning only directories that changed"""
+        changed = False
+        seen = set()
+        stack = [('', 0)]
+        while stack:
+            rel, depth = stack.pop()
+            try:
+                mtime = os.stat(os.path.join(self.root, rel)).st_mtime_ns
+            except OSError:
+                continue
+            listing = self.dirs.get(rel)
+            if listing is None or listing['mtime'] != mtime:
+                listing = self._list(rel, mtime)
+                if listing is None:
+                    continue
+                self.dirs[rel] = listing
+                changed = True
+            seen.add(rel)
+            if depth < self.max_depth:
+                stack.extend((sub, depth + 1) for sub in listing['subdirs'])
+        for rel in set(self.dirs) - seen:
+            del self.dirs[rel]
+            changed = True
+        self.checked = time.monotonic()
+        if changed or self.listing is None:
+            self.listing = [path for rel in sorted(self.dirs) for path in self.dirs[rel]['files']]
+        if changed:
+            self._save()
+
+    def files(self, extensions=None):
+        """Every indexed file (relative paths), optionally only these extensions"""
+        if self.checked is None or time.monotonic() - self.checked > self.max_age:
+            self.refresh()
+        if extensions:
+            return [path for path in self.listing if path.lower().endswith(extensions)]
+        return list(self.listing)
+
+    def search(self, query, extensions=None):
+        """Indexed files matching `query`, best match first"""
+        query = query.strip()
+        if not query:
+            return []
+        # Cheap regex test first so only candidates get scored
+        candidate = re.compile('.*?'.join(map(re.escape, query)), re.IGNORECASE | re.DOTALL).search
+        scored = []
+        for path in self.files(extensions):
+            if candidate(path):
+                score = fuzzy_score(query, path)
+                if score is not None:
+                    scored.append((-score, path.count(os.sep), len(path), path))
+        scored.sort()
+        return [path for _, _, _, path in scored]
+
+    def _load(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (isinstance(data, dict) and data.get('version') == self.VERSION
+                and data.get('max_depth') == self.max_depth and data.get('ignore') == self.ignore):
+            self.dirs = data.get('dirs', {})
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        data = {"version": self.VERSION, "root": os.path.abspath(self.root),
+                "max_depth": self.max_depth, "ignore": self.ignore, "dirs": self.dirs}
+        try:
+            private_makedirs(os.path.dirname(self.cache_path))
+            tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open_private(tmp) as f:
+                f.write(json.dumps(data).encode('utf-8'))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass  # the index is rebuilt next time
+
+def pick_file(files, heading, prompt="Choose file"):
+    """List `files` (the first MAX_LISTED_FILES) and let the user pick one; None to go back"""
+    print(heading)
+    shown = files[:MAX_LISTED_FILES]
+    for i, file in enumerate(shown, 1):
+        print(f"   {i}. {file}")
+    if len(files) > len(shown):
+        print(f"   … and {len(files) - len(shown)} more (search to narrow it down)")
+    try:
+        choice = int(input(f"\n{prompt} (1-{len(shown)}) or 0 to go back: ").strip())
+    except ValueError:
+        print("❌ Please enter a valid number")
+        return None
+    if choice == 0:
+        return None
+    if 1 <= choice <= len(shown):
+        return shown[choice - 1]
+    print("❌ Invalid choice")
+    return None
 
 def interactive_wizard():
     """Interactive wizard for creating GitHub issues"""
@@ -159,11 +3295,13 @@ def interactive_wizard():
     if mode_choice == '2':
         # Batch mode
         batch_file = None
+        # Indexed once for the session (and kept between runs), then only revalidated
+        index = FileIndex('.', cache_path=default_index_path('.'))
         while not batch_file:
             print("\n📁 Batch file options:")
             print("   1. Type file path or partial name")
-            print("   2. Browse current directory")
-            print("   3. List .json files in current directory")
+            print("   2. Browse files (this directory and below)")
+            print("   3. List batch files (.json, .jsonl, .csv)")
             print("   4. Search for files by name")
             
             file_choice = input("Choose option (1-4): ").strip()
@@ -176,125 +3314,40 @@ def interactive_wizard():
                 # Check if it's an exact path first
                 if os.path.exists(user_input):
                     batch_file = user_input
+                    continue
+                # Try to find files matching the partial name
+                matching_files = index.search(user_input)
+                if not matching_files:
+                    print(f"❌ No files found matching '{user_input}'")
+                elif len(matching_files) == 1:
+                    batch_file = matching_files[0]
+                    print(f"✅ Found: {batch_file}")
                 else:
-                    # Try to find files matching the partial name
-                    try:
-                        all_files = [f for f in os.listdir('.') if os.path.isfile(f)]
-                        matching_files = [f for f in all_files if user_input.lower() in f.lower()]
-                        
-                        if not matching_files:
-                            print(f"❌ No files found matching '{user_input}'")
-                            continue
-                        elif len(matching_files) == 1:
-                            batch_file = matching_files[0]
-                            print(f"✅ Found: {batch_file}")
-                        else:
-                            print(f"\n� Found {len(matching_files)} files matching '{user_input}':")
-                            for i, file in enumerate(matching_files, 1):
-                                print(f"   {i}. {file}")
-                            
-                            try:
-                                choice = int(input(f"\nChoose file (1-{len(matching_files)}) or 0 to try again: ").strip())
-                                if choice == 0:
-                                    continue
-                                elif 1 <= choice <= len(matching_files):
-                                    batch_file = matching_files[choice - 1]
-                                else:
-                                    print("❌ Invalid choice")
-                                    continue
-                            except ValueError:
-                                print("❌ Please enter a valid number")
-                                continue
-                    except Exception as e:
-                        print(f"❌ Error searching files: {e}")
-                        continue
+                    batch_file = pick_file(matching_files, f"\n🔍 Found {len(matching_files)} files matching '{user_input}':")
                         
             elif file_choice == '2':
-                print("\n📂 Files in current directory:")
-                try:
-                    files = [f for f in os.listdir('.') if os.path.isfile(f)]
-                    if files:
-                        for i, file in enumerate(files, 1):
-                            print(f"   {i}. {file}")
-                        
-                        try:
-                            choice = int(input(f"\nChoose file (1-{len(files)}) or 0 to cancel: ").strip())
-                            if choice == 0:
-                                continue
-                            elif 1 <= choice <= len(files):
-                                batch_file = files[choice - 1]
-                            else:
-                                print("❌ Invalid choice")
-                                continue
-                        except ValueError:
-                            print("❌ Please enter a valid number")
-                            continue
-                    else:
-                        print("❌ No files found in current directory")
-                        continue
-                except Exception as e:
-                    print(f"❌ Error listing files: {e}")
-                    continue
+                files = index.files()
+                if files:
+                    batch_file = pick_file(files, f"\n📂 {len(files)} files in this directory and below:")
+                else:
+                    print("❌ No files found in current directory")
                     
             elif file_choice == '3':
-                print("\n📄 JSON files in current directory:")
-                try:
-                    json_files = [f for f in os.listdir('.') if f.endswith('.json')]
-                    if json_files:
-                        for i, file in enumerate(json_files, 1):
-                            print(f"   {i}. {file}")
-                        
-                        try:
-                            choice = int(input(f"\nChoose JSON file (1-{len(json_files)}) or 0 to cancel: ").strip())
-                            if choice == 0:
-                                continue
-                            elif 1 <= choice <= len(json_files):
-                                batch_file = json_files[choice - 1]
-                            else:
-                                print("❌ Invalid choice")
-                                continue
-                        except ValueError:
-                            print("❌ Please enter a valid number")
-                            continue
-                    else:
-                        print("❌ No JSON files found in current directory")
-                        continue
-                except Exception as e:
-                    print(f"❌ Error listing JSON files: {e}")
-                    continue
+                batch_files = index.files(BATCH_FILE_EXTENSIONS)
+                if batch_files:
+                    batch_file = pick_file(batch_files, f"\n📄 {len(batch_files)} batch files:", "Choose batch file")
+                else:
+                    print("❌ No .json, .jsonl or .csv files found")
                     
             elif file_choice == '4':
                 search_term = input("🔍 Enter search term for filename: ").strip()
                 if not search_term:
                     continue
-                    
-                try:
-                    all_files = [f for f in os.listdir('.') if os.path.isfile(f)]
-                    matching_files = [f for f in all_files if search_term.lower() in f.lower()]
-                    
-                    if not matching_files:
-                        print(f"❌ No files found containing '{search_term}'")
-                        continue
-                    else:
-                        print(f"\n🔍 Found {len(matching_files)} files containing '{search_term}':")
-                        for i, file in enumerate(matching_files, 1):
-                            print(f"   {i}. {file}")
-                        
-                        try:
-                            choice = int(input(f"\nChoose file (1-{len(matching_files)}) or 0 to search again: ").strip())
-                            if choice == 0:
-                                continue
-                            elif 1 <= choice <= len(matching_files):
-                                batch_file = matching_files[choice - 1]
-                            else:
-                                print("❌ Invalid choice")
-                                continue
-                        except ValueError:
-                            print("❌ Please enter a valid number")
-                            continue
-                except Exception as e:
-                    print(f"❌ Error searching files: {e}")
-                    continue
+                matching_files = index.search(search_term)
+                if matching_files:
+                    batch_file = pick_file(matching_files, f"\n🔍 Found {len(matching_files)} files matching '{search_term}' (best first):")
+                else:
+                    print(f"❌ No files found matching '{search_term}'")
             else:
                 print("❌ Please enter 1, 2, 3, or 4")
                 continue
@@ -315,18 +3368,38 @@ def interactive_wizard():
                     print("❌ GitHub token is required for batch operations")
                     sys.exit(1)            # Confirm batch operation
             try:
-                with open(batch_file, 'r') as f:
-                    data = json.load(f)
-                issue_count = len(data.get('issues', []))
+                validation = validate_batch(batch_file, (owner, repo))
+                issue_count, invalid, errors, targets, _, updates = validation
                 print(f"\n📊 Found {issue_count} issues in '{batch_file}'")
-                confirm = input(f"✅ Create {issue_count} issues in {owner}/{repo}? (y/N): ").strip().lower()
+                if invalid:
+                    print_validation_errors(invalid, errors)
+                    sys.exit(1)
+                if not targets:
+                    print("❌ No issues to create")
+                    return
+                resume = False
+                if os.path.exists(default_journal_path(batch_file)):
+                    print(f"📒 Found a journal of issues already created from '{batch_file}'")
+                    resume = input("⏭️  Skip issues that were already created? (Y/n): ").strip().lower() not in ['n', 'no']
+                if len(targets) > 1:
+                    where = f"across {len(targets)} repositories"
+                else:
+                    where = f"in {next(iter(targets))}"
+                to_update = sum(len(numbers) for numbers in updates.values())
+                to_create = sum(targets.values()) - to_update
+                if to_update:
+                    action = f"Update {to_update}" + (f" and create {to_create}" if to_create else "")
+                else:
+                    action = f"Create {to_create}"
+                confirm = input(f"✅ {action} issues {where}? (y/N): ").strip().lower()
                 if confirm in ['y', 'yes']:
-                    create_batch_issues(owner, repo, batch_file, token)
+                    create_batch_issues(owner, repo, batch_file, token, resume=resume, output='progress',
+                                        validation=validation)
                     return
                 else:
                     print("❌ Batch creation cancelled")
                     return
-            except (json.JSONDecodeError, FileNotFoundError) as e:
+            except (BatchFileError, UnicodeDecodeError, OSError) as e:
                 print(f"❌ Error reading batch file: {e}")
                 sys.exit(1)
         else:
@@ -485,6 +3558,24 @@ def main():
   Batch Mode:
     ./create_issue.py "github.com/user/repo" --batch issues.json
     ./create_issue.py "user/repo" -b batch-issues.json --token YOUR_TOKEN
+    ./create_issue.py "user/repo" -b issues.json --concurrency 8 --ordered
+    ./create_issue.py "user/repo" -b issues.json --resume   # continue an interrupted batch
+    ./create_issue.py "user/repo" -b issues.json --duplicates skip
+    ./create_issue.py "user/repo" -b issues.json --dry-run  # validate only
+    ./create_issue.py "user/repo" -b issues.json --transport async --concurrency 200
+    ./create_issue.py --batch tracking.json   # items list their own "repo" / "repos"
+    ./create_issue.py "user/repo" -b issues.json --transport graphql --graphql-chunk 25
+    ./create_issue.py "user/repo" -b services.csv --template upgrade.json
+    ./create_issue.py "user/repo" -b edits.jsonl   # items with a "number" update that issue
+  
+  Export (incremental on later runs):
+    ./create_issue.py "user/repo" --export issues.jsonl
+    ./create_issue.py "user/repo" --export open.jsonl --state open --concurrency 16
+  
+  Server Mode (one warm process for many callers):
+    ./create_issue.py --serve --concurrency 10            # or: --serve --socket /tmp/issues.sock
+    export CREATE_ISSUE_SERVER=http://127.0.0.1:8765
+    ./create_issue.py "user/repo" "Title" "Description"   # forwarded to the server
   
   With custom token:
     ./create_issue.py "user/repo" "Title" "Description" --token YOUR_TOKEN
@@ -505,23 +3596,164 @@ def main():
                        help="Issue description/body")
     parser.add_argument("--token", 
                        help="GitHub personal access token (or set GITHUB_TOKEN environment variable)")
+    parser.add_argument("--tokens-file", metavar="FILE",
+                       help=f"Batch and --serve: more tokens, one per line (also read from ${TOKENS_ENV}); "
+                            "each request uses the token with the most rate limit left")
     parser.add_argument("--interactive", "-i", action="store_true", 
                        help="Launch interactive wizard mode")
     parser.add_argument("--batch", "-b", 
-                       help="Create multiple issues from JSON file (requires repo_url)")
+                       help="Create multiple issues from a JSON, JSON Lines or CSV file (repo_url is the default "
+                            "target; items can name their own with 'repo' or 'repos'). Items with a 'number' "
+                            "update that issue, sending only the fields that changed")
+    parser.add_argument("--export", metavar="FILE",
+                       help="Write the repo's issues to FILE as JSON Lines in the batch format; "
+                            "later runs only fetch issues changed since the last export")
+    parser.add_argument("--state", choices=EXPORT_STATES, default="all",
+                       help="Export: which issues to include (default: all)")
+    parser.add_argument("--full", action="store_true",
+                       help="Export: ignore the previous export and fetch every issue again")
+    parser.add_argument("--template", metavar="FILE",
+                       help="Batch mode: JSON file with a title/description template and default vars; "
+                            "items (or CSV rows) fill in the {{placeholders}}")
+    parser.add_argument("--concurrency", "-c", type=int, metavar="N",
+                       help="Number of requests in parallel (default: 1 in batch mode, 10 with --serve, "
+                            "8 pages with --export)")
+    parser.add_argument("--ordered", action="store_true",
+                       help="Report batch results in input order when using --concurrency")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Only validate the batch file; don't create any issues")
+    parser.add_argument("--resume", action="store_true",
+                       help="Skip batch items already created according to the journal")
+    parser.add_argument("--journal", metavar="FILE",
+                       help="Journal of created batch issues (default: <batch file>.journal.jsonl)")
+    parser.add_argument("--duplicates", choices=["skip", "flag"],
+                       help="Check batch items against the repo's open issues first and skip or flag duplicates")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Don't keep an on-disk ETag cache of GitHub GET responses")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                       help=f"Where to keep the response cache (default: {default_cache_dir()})")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="sync",
+                       help="How to send requests: 'sync' (requests + threads, default), "
+                            "'async' (asyncio + httpx, for thousands of requests in flight) or "
+                            "'graphql' (batch mode: many issues per request)")
+    parser.add_argument("--graphql-chunk", type=int, default=DEFAULT_GRAPHQL_CHUNK, metavar="N",
+                       help=f"Issues per GraphQL request with --transport graphql (default: {DEFAULT_GRAPHQL_CHUNK})")
+    parser.add_argument("--max-rate", type=float, metavar="N",
+                       help="Never send more than N requests per second (default: paced by GitHub's rate-limit headers)")
+    parser.add_argument("--max-writes", type=int, default=CONTENT_CREATION_PER_MINUTE, metavar="N",
+                       help="Never create more than N issues or labels per minute per token (default: "
+                            f"{CONTENT_CREATION_PER_MINUTE}, GitHub's content-creation limit)")
+    parser.add_argument("--verbose", "-v", dest="output", action="store_const", const="verbose",
+                       default="progress",
+                       help="Batch mode: print every issue as it is created instead of a progress line")
+    parser.add_argument("--quiet", "-q", dest="output", action="store_const", const="quiet",
+                       help="Batch mode: print only errors and the final summary")
+    parser.add_argument("--results", metavar="FILE",
+                       help="Batch mode: write every issue's outcome to FILE as JSON Lines")
+    parser.add_argument("--serve", action="store_true",
+                       help="Keep running and create issues sent by other invocations (see --server)")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVE_PORT,
+                       help=f"Localhost port for --serve (default: {DEFAULT_SERVE_PORT})")
+    parser.add_argument("--socket", metavar="PATH",
+                       help="Serve on a Unix socket instead of a localhost port")
+    parser.add_argument("--server", metavar="ADDRESS", default=os.environ.get(SERVER_ENV),
+                       help="Forward the issue to a running --serve process, e.g. http://127.0.0.1:8765 "
+                            f"or unix:/tmp/issues.sock (default: ${SERVER_ENV})")
+    parser.add_argument("--max-attempts", type=int, default=5, metavar="N",
+                       help="Attempts per request on 5xx answers and connection errors, with "
+                            "exponential backoff (default: 5, 1 disables retries)")
+    parser.add_argument("--metrics", metavar="FILE",
+                       help="Record the timing of every API call to FILE and print a latency summary")
+    parser.add_argument("--metrics-format", choices=METRICS_FORMATS, default="jsonl",
+                       help="'jsonl' (one JSON line per request, default) or 'prom' (Prometheus textfile)")
     
     args = parser.parse_args()
     
-    # Handle batch mode
-    if args.batch:
+    if args.concurrency is None:
+        args.concurrency = 10 if args.serve else 8 if args.export else 1
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.graphql_chunk < 1:
+        parser.error("--graphql-chunk must be at least 1")
+    if args.max_rate is not None and args.max_rate <= 0:
+        parser.error("--max-rate must be greater than 0")
+    if args.max_writes < 1:
+        parser.error("--max-writes must be at least 1")
+    if args.max_attempts < 1:
+        parser.error("--max-attempts must be at least 1")
+    
+    metrics = Metrics(args.metrics, args.metrics_format) if args.metrics else None
+    try:
+        run_cli(args, metrics)
+    finally:
+        if metrics is not None:
+            metrics.close()
+            metrics.print_summary()
+
+TOKENS_ENV = "GITHUB_TOKENS"
+
+def pool_tokens(tokens_file=None):
+    """Extra tokens for a pool: one per line of tokens_file, and from $GITHUB_TOKENS"""
+    tokens = os.environ.get(TOKENS_ENV, '').replace(',', ' ').split()
+    if tokens_file:
+        try:
+            with open(tokens_file, 'r', encoding='utf-8') as f:
+                tokens += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except OSError as e:
+            print(f"❌ Error: Could not read tokens file: {e}")
+            sys.exit(1)
+    return tokens
+
+def client_from_args(args, token, metrics=None):
+    """GitHubClient for batch and --serve runs, spreading requests over every token given"""
+    tokens = list(dict.fromkeys([token] + pool_tokens(args.tokens_file)))
+    pool = None
+    if len(tokens) > 1:
+        pool = TokenPool(tokens, burst=args.concurrency, max_rate=args.max_rate,
+                         writes_per_minute=args.max_writes)
+        print(f"🔑 Spreading requests over {len(tokens)} tokens")
+    return GitHubClient(token, pool_size=args.concurrency,
+                        limiter=RateLimiter(burst=args.concurrency, max_rate=args.max_rate),
+                        cache=None if args.no_cache else ResponseCache(args.cache_dir),
+                        metrics=metrics, retry=RetryPolicy(args.max_attempts), tokens=pool,
+                        write_limiter=content_creation_limiter(args.max_writes))
+
+def run_cli(args, metrics=None):
+    """Create the issue(s) described by the parsed command line"""
+    if args.serve:
+        token = args.token or os.environ.get("GITHUB_TOKEN") or next(iter(pool_tokens(args.tokens_file)), None)
+        if not token:
+            print(f"❌ Error: --serve needs a GitHub token (--token, GITHUB_TOKEN or {TOKENS_ENV})")
+            sys.exit(1)
+        client = client_from_args(args, token, metrics)
+        with client:
+            serve(client, concurrency=args.concurrency, port=args.port, socket_path=args.socket)
+        return
+    
+    if args.export:
+        token = args.token or os.environ.get("GITHUB_TOKEN") or next(iter(pool_tokens(args.tokens_file)), None)
+        if not token:
+            print(f"❌ Error: --export needs a GitHub token (--token, GITHUB_TOKEN or {TOKENS_ENV})")
+            sys.exit(1)
         if not args.repo_url:
-            print("❌ Error: Repository URL is required for batch mode")
-            print("Usage: ./create_issue.py <repo_url> --batch <file.json>")
+            print("❌ Error: --export needs the repository to export")
             sys.exit(1)
+        try:
+            owner, repo = parse_github_url(args.repo_url)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        with client_from_args(args, token, metrics) as client:
+            export_issues(client, owner, repo, args.export, state=args.state,
+                          concurrency=args.concurrency, full=args.full)
+        return
+    
+    # Handle batch mode
+    if args.batch:
         
-        # Get token
-        token = args.token or os.environ.get("GITHUB_TOKEN")
-        if not token:
+        # Get token (a dry run never talks to GitHub)
+        token = args.token or os.environ.get("GITHUB_TOKEN") or next(iter(pool_tokens(args.tokens_file)), None)
+        if not token and not args.dry_run:
             print("🔑 GitHub token not found")
             print("💡 You can either:")
             print("   1. Use: ./create_issue.py ... --token 'your_token'")
@@ -532,9 +3764,27 @@ def main():
                 print("❌ Error: GitHub token is required for batch operations.")
                 sys.exit(1)
         
+        template = None
+        if args.template:
+            try:
+                template = load_template(args.template)
+            except BatchFileError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+        
         try:
-            owner, repo = parse_github_url(args.repo_url)
-            create_batch_issues(owner, repo, args.batch, token)
+            # Without a repo_url every item must name its own 'repo' / 'repos'
+            owner, repo = parse_github_url(args.repo_url) if args.repo_url else (None, None)
+            client = None
+            if not args.dry_run:
+                # A dry run never sends anything, so don't even load the HTTP stack
+                client = client_from_args(args, token, metrics)
+            create_batch_issues(owner, repo, args.batch, token,
+                                concurrency=args.concurrency, ordered=args.ordered,
+                                client=client, journal_path=args.journal, resume=args.resume,
+                                duplicates=args.duplicates, dry_run=args.dry_run,
+                                transport=args.transport, graphql_chunk=args.graphql_chunk,
+                                output=args.output, results_path=args.results, template=template)
             return
         except ValueError as e:
             print(f"❌ Error: {e}")
@@ -549,6 +3799,10 @@ def main():
         interactive_wizard()
         return
     
+    if args.server:
+        forward_to_server(args.server, args.repo_url, args.title, args.body)
+        return
+    
     # Get token from argument or environment variable
     token = args.token or os.environ.get("GITHUB_TOKEN")
     if token and not args.token:
@@ -568,7 +3822,11 @@ def main():
     try:
         owner, repo = parse_github_url(args.repo_url)
         print(f"📂 Repository: {owner}/{repo}")
-        create_issue(owner, repo, args.title, args.body, token)
+        client = GitHubClient(token, pool_size=1, limiter=RateLimiter(max_rate=args.max_rate),
+                              metrics=metrics, retry=RetryPolicy(args.max_attempts),
+                              write_limiter=content_creation_limiter(args.max_writes))
+        create_issue(owner, repo, args.title, args.body, token, client=client,
+                     transport=args.transport)
     except ValueError as e:
         print(f"❌ Error: {e}")
         print("💡 Expected formats:")